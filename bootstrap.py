@@ -7,6 +7,8 @@ import json
 from pathlib import Path
 import logging
 
+from json_loader import read_json
+
 class Bootstrap:
     """Bootstraps the entire system"""
     
@@ -63,12 +65,11 @@ class Bootstrap:
                     json.dump(cfg, f, indent=2, ensure_ascii=False)
                 self.logger.info(f"📝 Created {filename}")
             else:
-                with open(path, "r", encoding="utf-8") as f:
-                    try:
-                        self.config[filename] = json.load(f)
-                    except json.JSONDecodeError:
-                        self.logger.warning(f"⚠️ Invalid JSON in {filename}, using defaults")
-                        self.config[filename] = cfg
+                try:
+                    self.config[filename] = read_json(path)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"⚠️ Invalid JSON in {filename}, using defaults")
+                    self.config[filename] = cfg
 
     async def _init_directories(self):
         """Initialize required directories"""
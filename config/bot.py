@@ -1,15 +0,0 @@
-# config/bot.py
-
-"""
-Bot Configuration
-=================
-এই ফাইলটি তোমার Telegram Bot Token রাখবে।
-"""
-
-# তোমার Telegram Bot Token এখানে বসাও
-BOT_TOKEN = "YOUR_TELEGRAM_BOT_TOKEN_HERE"
-
-# Optional: Bot name or other basic settings
-BOT_NAME = "𝗡𝗢𝗠𝗜 ⟵𝗼_𝟬"
-LANGUAGE = "bn"          # bn = Bangla
-TIMEZONE = "Asia/Dhaka"
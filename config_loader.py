@@ -9,6 +9,8 @@ from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from enum import Enum
 
+from json_loader import read_json
+
 class BotMode(Enum):
     """Bot operation modes"""
     PRODUCTION = "production"
@@ -106,8 +108,7 @@ class ConfigLoader:
             await self._save_bot_config()
         else:
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_json(config_file)
                     
                 # Convert mode string to enum
                 if 'mode' in data:
@@ -128,8 +129,7 @@ class ConfigLoader:
             await self._save_db_config()
         else:
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_json(config_file)
                 self.db_config = DatabaseConfig(**data)
             except Exception as e:
                 self.logger.error(f"❌ Error loading DB config: {e}")
@@ -144,8 +144,7 @@ class ConfigLoader:
             await self._save_api_config()
         else:
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_json(config_file)
                 self.api_config = APIConfig(**data)
             except Exception as e:
                 self.logger.error(f"❌ Error loading API config: {e}")
@@ -160,8 +159,7 @@ class ConfigLoader:
             await self._save_cache_config()
         else:
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_json(config_file)
                 self.cache_config = CacheConfig(**data)
             except Exception as e:
                 self.logger.error(f"❌ Error loading cache config: {e}")
@@ -176,8 +174,7 @@ class ConfigLoader:
             await self._save_perf_config()
         else:
             try:
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = read_json(config_file)
                 self.perf_config = PerformanceConfig(**data)
             except Exception as e:
                 self.logger.error(f"❌ Error loading perf config: {e}")
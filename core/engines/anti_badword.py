@@ -32,6 +32,8 @@ class AntiBadword:
         self.logger = logging.getLogger("nomi_antibadword")
         self.badwords = set()
         self.badword_patterns = []
+        self._fused_pattern = None
+        self._fused_words: List[str] = []
         self.whitelist_words = set()
         self.user_warnings = {}
         self.word_categories = {}
@@ -76,7 +78,7 @@ class AntiBadword:
         
         # Add to badwords set
         self.badwords.update(bengali_badwords)
-        self.badwords.update(english_boodwords)
+        self.badwords.update(english_badwords)
         
         # Create patterns for common variations
         self._create_patterns()
@@ -92,6 +94,22 @@ class AntiBadword:
             pattern = self._word_to_pattern(word)
             self.badword_patterns.append((pattern, word))
             
+        self._compile_fused_pattern()
+        
+    def _compile_fused_pattern(self):
+        """Fuse all badword patterns into one compiled alternation"""
+        if not self.badword_patterns:
+            self._fused_pattern = None
+            self._fused_words = []
+            return
+            
+        # One capture group per word, group N maps to _fused_words[N - 1]
+        self._fused_pattern = re.compile(
+            "|".join(f"({pattern})" for pattern, _ in self.badword_patterns),
+            re.IGNORECASE
+        )
+        self._fused_words = [word for _, word in self.badword_patterns]
+        
     def _word_to_pattern(self, word: str) -> str:
         """Convert word to regex pattern with common obfuscations"""
         # Character substitution mapping
@@ -197,10 +215,10 @@ class AntiBadword:
             elif word in self.whitelist_words:
                 continue
                 
-        # Check against patterns (for obfuscated words)
-        for pattern, original_word in self.badword_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        # Check against patterns (for obfuscated words) in a single pass
+        if self._fused_pattern is not None:
+            for match in self._fused_pattern.finditer(text):
+                original_word = self._fused_words[match.lastindex - 1]
                 found.append((original_word, (match.start(), match.end())))
                 
         # Remove duplicates
@@ -321,6 +339,7 @@ class AntiBadword:
         # Update patterns
         pattern = self._word_to_pattern(word_lower)
         self.badword_patterns.append((pattern, word_lower))
+        self._compile_fused_pattern()
         
         self.logger.info(f"🚫 Added badword: {word_lower} ({category})")
         return True
@@ -351,6 +370,7 @@ class AntiBadword:
             (p, w) for p, w in self.badword_patterns 
             if w != word_lower
         ]
+        self._compile_fused_pattern()
         
         self.logger.info(f"✅ Removed badword: {word_lower}")
         return True
@@ -20,6 +20,7 @@ class AutoReplyEngine:
         self.reply_patterns = {}
         self.conversation_context = {}
         self.message_history = {}
+        self._compiled_patterns: List[tuple] = []
         
     async def initialize(self):
         """Initialize auto reply engine"""
@@ -30,8 +31,34 @@ class AutoReplyEngine:
         """Load reply patterns from JSON"""
         reply_config = await self.json_loader.load("responses/auto_reply.json")
         self.reply_patterns = reply_config.get("patterns", {})
+        self._compile_patterns()
         self.logger.info(f"📝 Loaded {len(self.reply_patterns)} reply patterns")
         
+    def _compile_patterns(self):
+        """Precompute lowercase text, regex and word set for every pattern"""
+        compiled = []
+        
+        for pattern_id, pattern_data in self.reply_patterns.items():
+            if not pattern_data.get("patterns") or not pattern_data.get("response"):
+                continue
+                
+            for pattern in pattern_data["patterns"]:
+                try:
+                    regex = re.compile(pattern, re.IGNORECASE)
+                except re.error:
+                    regex = None
+                    
+                pattern_lower = pattern.lower()
+                compiled.append((
+                    pattern_id,
+                    pattern_data,
+                    pattern_lower,
+                    regex,
+                    frozenset(pattern_lower.split())
+                ))
+                
+        self._compiled_patterns = compiled
+        
     async def handle_message(self, message: str, user_id: int, 
                            group_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
@@ -94,28 +121,25 @@ class AutoReplyEngine:
         """
         best_match = None
         best_score = 0
+        message_words = set(message.split())
         
-        for pattern_id, pattern_data in self.reply_patterns.items():
-            patterns = pattern_data.get("patterns", [])
-            response = pattern_data.get("response")
-            voice = pattern_data.get("voice")
+        for pattern_id, pattern_data, pattern_lower, regex, pattern_words in self._compiled_patterns:
+            score = self._calculate_match_score(message, message_words, 
+                                                pattern_lower, regex, pattern_words)
             
-            if not patterns or not response:
-                continue
-                
-            # Check each pattern
-            for pattern in patterns:
-                score = await self._calculate_match_score(message, pattern, pattern_data)
+            if score > best_score:
+                best_score = score
+                best_match = {
+                    "pattern_id": pattern_id,
+                    "response": pattern_data.get("response"),
+                    "voice": pattern_data.get("voice"),
+                    "confidence": score,
+                    "pattern_data": pattern_data
+                }
                 
-                if score > best_score:
-                    best_score = score
-                    best_match = {
-                        "pattern_id": pattern_id,
-                        "response": response,
-                        "voice": voice,
-                        "confidence": score,
-                        "pattern_data": pattern_data
-                    }
+                # Nothing scores higher than an exact match
+                if score >= 1.0:
+                    break
                     
         # Only return if score is above threshold
         if best_score > 0.6:  # 60% match threshold
@@ -123,38 +147,35 @@ class AutoReplyEngine:
             
         return None
         
-    async def _calculate_match_score(self, message: str, pattern: str, 
-                                   pattern_data: Dict) -> float:
+    def _calculate_match_score(self, message: str, message_words: set, 
+                               pattern_lower: str, regex: Optional[re.Pattern],
+                               pattern_words: frozenset) -> float:
         """
         Calculate match score between message and pattern
         
         Args:
             message: User message
-            pattern: Pattern to match
-            pattern_data: Pattern metadata
+            message_words: Words of the user message
+            pattern_lower: Lowercased pattern
+            regex: Compiled pattern (None if not a valid regex)
+            pattern_words: Words of the pattern
             
         Returns:
             Match score 0-1
         """
         # Exact match
-        if message == pattern.lower():
+        if message == pattern_lower:
             return 1.0
             
         # Contains match
-        if pattern.lower() in message:
+        if pattern_lower in message:
             return 0.8
             
         # Regex match
-        try:
-            if re.search(pattern, message, re.IGNORECASE):
-                return 0.9
-        except:
-            pass
+        if regex is not None and regex.search(message):
+            return 0.9
             
         # Word-based match
-        message_words = set(message.split())
-        pattern_words = set(pattern.lower().split())
-        
         if pattern_words:
             intersection = message_words.intersection(pattern_words)
             score = len(intersection) / len(pattern_words)
@@ -261,6 +282,7 @@ class AutoReplyEngine:
         }
         
         self.reply_patterns[pattern_id] = new_pattern
+        self._compile_patterns()
         
         # Save to JSON
         await self._save_patterns()
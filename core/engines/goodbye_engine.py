@@ -9,6 +9,7 @@ from datetime import datetime
 import random
 
 from core.utils.voice_utils import generate_goodbye_voice
+from core.utils.string_utils import StringUtils
 
 class GoodbyeEngine:
     """Engine for goodbye messages"""
@@ -19,7 +20,7 @@ class GoodbyeEngine:
         self.leave_cache = {}
         
     async def handle_member_leave(self, user_data: Dict[str, Any], 
-                                 group_data: Dict[str, Any]) -> Dict[str, Any]:
+                                 group_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Handle member leave
         
@@ -28,13 +29,18 @@ class GoodbyeEngine:
             group_data: Group information
             
         Returns:
-            Response data
+            Response data or None if goodbye is disabled
         """
-        self.logger.info(f"👋 Member left: {user_data.get('username', 'Unknown')}")
-        
         # Load goodbye configuration
         goodbye_config = await self.json_loader.load("responses/goodbye.json")
         
+        # Skip all work when goodbye is disabled globally or for the group
+        if not goodbye_config.get("enabled", True) or \
+                not group_data.get("settings", {}).get("goodbye_enabled", True):
+            return None
+            
+        self.logger.info(f"👋 Member left: {user_data.get('username', 'Unknown')}")
+        
         # Prepare response
         response = {
             "engine": "goodbye",
@@ -49,7 +55,7 @@ class GoodbyeEngine:
         response["message"] = goodbye_message
         
         # Generate goodbye voice if enabled
-        if goodbye_config.get("voice", True):
+        if goodbye_config.get("voice_enabled", goodbye_config.get("voice", True)):
             voice_path = await self._generate_goodbye_voice(goodbye_message, user_data)
             if voice_path:
                 response["voice"] = voice_path
@@ -99,10 +105,7 @@ class GoodbyeEngine:
         }
         
         # Replace variables in template
-        message = template
-        for key, value in variables.items():
-            placeholder = "{" + key + "}"
-            message = message.replace(placeholder, str(value))
+        message = StringUtils.format_template(template, variables)
             
         return message
         
@@ -185,10 +188,7 @@ class GoodbyeEngine:
             "time": datetime.now().strftime("%H:%M")
         }
         
-        message = template
-        for key, value in variables.items():
-            placeholder = "{" + key + "}"
-            message = message.replace(placeholder, str(value))
+        message = StringUtils.format_template(template, variables)
             
         return message
         
@@ -4,11 +4,25 @@ Group Engine - Handles group management and operations
 
 import asyncio
 import logging
+import os
+import random
+import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pathlib import Path
 import json
 
+from json_loader import read_json
+from shutdown import register_flush
+
+def _write_groups_file(groups_file: Path, data: str):
+    """Write to a temp file and swap it into place (runs in a thread)"""
+    groups_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = groups_file.with_suffix(".json.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_file, groups_file)
+
 class GroupEngine:
     """Engine for group management"""
     
@@ -17,6 +31,20 @@ class GroupEngine:
         self.json_loader = json_loader
         self.groups = {}
         self.group_cache = {}
+        self.save_delay = 0.25
+        self._save_task: Optional[asyncio.Task] = None
+        # Set on every change, cleared when a write picks it up
+        self._dirty = False
+        # One groups file write at a time (writes run in a worker thread)
+        self._save_lock = asyncio.Lock()
+        # Set by flush() to cut the debounce delay short
+        self._flush_event = asyncio.Event()
+        self.member_count_ttl = 300
+        self._member_count_cache: Dict[int, tuple] = {}
+        self.chat_info_ttl = 60
+        self._chat_info_cache: Dict[int, tuple] = {}
+        # Pending debounced saves are written out on shutdown
+        register_flush(self.flush)
         
     async def initialize(self):
         """Initialize group engine"""
@@ -28,25 +56,67 @@ class GroupEngine:
         try:
             groups_file = Path("data/groups.json")
             if groups_file.exists():
-                with open(groups_file, 'r', encoding='utf-8') as f:
-                    self.groups = json.load(f)
+                # Read and parse off the event loop
+                self.groups = await asyncio.to_thread(read_json, groups_file)
                     
                 self.logger.info(f"📂 Loaded {len(self.groups)} groups")
         except Exception as e:
             self.logger.error(f"❌ Error loading groups: {e}")
             self.groups = {}
             
-    async def _save_groups(self):
-        """Save groups to storage"""
-        try:
-            groups_file = Path("data/groups.json")
-            groups_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(groups_file, 'w', encoding='utf-8') as f:
-                json.dump(self.groups, f, indent=2, ensure_ascii=False)
+    async def _save_groups(self) -> bool:
+        """
+        Save groups to storage
+        
+        Returns:
+            True if the file was written
+        """
+        async with self._save_lock:
+            try:
+                groups_file = Path("data/groups.json")
                 
-        except Exception as e:
-            self.logger.error(f"❌ Error saving groups: {e}")
+                # Serialize on the loop so no handler mutates groups mid-dump,
+                # then do the blocking write in a worker thread. Changes made
+                # during the write mark the engine dirty again.
+                self._dirty = False
+                data = json.dumps(self.groups, indent=2, ensure_ascii=False)
+                await asyncio.to_thread(_write_groups_file, groups_file, data)
+                return True
+                    
+            except Exception as e:
+                self._dirty = True
+                self.logger.error(f"❌ Error saving groups: {e}")
+                return False
+            
+    def _schedule_save(self):
+        """Schedule a debounced save of groups"""
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._delayed_save())
+            
+    async def _delayed_save(self):
+        """Coalesce pending changes into as few writes as possible"""
+        # Keep going while changes arrive during a write; stop on failure
+        # and let the next change retry
+        while self._dirty:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.save_delay)
+            except asyncio.TimeoutError:
+                pass
+            if not await self._save_groups():
+                break
+        
+    async def flush(self):
+        """Write pending changes and wait for any in-flight save"""
+        # Never cancel the save task, its write may already be running
+        # in a thread; wake it up and wait for it instead
+        if self._save_task and not self._save_task.done():
+            self._flush_event.set()
+            await self._save_task
+            self._flush_event.clear()
+        self._save_task = None
+        if self._dirty:
+            await self._save_groups()
             
     async def register_group(self, group_id: int, group_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -143,6 +213,129 @@ class GroupEngine:
         
         return group
         
+    async def get_member_count(self, bot, chat_id: int) -> int:
+        """
+        Get chat member count with a TTL cache
+        
+        Args:
+            bot: Telegram bot instance
+            chat_id: Chat ID
+            
+        Returns:
+            Member count
+        """
+        cached = self._member_count_cache.get(chat_id)
+        now = time.monotonic()
+        if cached and now < cached[0]:
+            return cached[1]
+            
+        try:
+            count = await bot.get_chat_member_count(chat_id)
+        except Exception as e:
+            self.logger.error(f"❌ Error getting member count for {chat_id}: {e}")
+            return cached[1] if cached else self.groups.get(str(chat_id), {}).get("member_count", 0)
+            
+        # Jitter expiry so big groups don't all refresh at once
+        expires_at = now + self.member_count_ttl * random.uniform(0.9, 1.1)
+        self._member_count_cache[chat_id] = (expires_at, count)
+        return count
+        
+    async def get_chat_info(self, bot, chat_id: int) -> Dict[str, Any]:
+        """
+        Get chat details from Telegram with a TTL cache
+        
+        Args:
+            bot: Telegram bot instance
+            chat_id: Chat ID
+            
+        Returns:
+            Chat info (empty if it could not be fetched)
+        """
+        cached = self._chat_info_cache.get(chat_id)
+        now = time.monotonic()
+        if cached and now < cached[0]:
+            return cached[1]
+            
+        try:
+            chat = await bot.get_chat(chat_id)
+        except Exception as e:
+            self.logger.error(f"❌ Error getting chat {chat_id}: {e}")
+            return cached[1] if cached else {}
+            
+        info = {
+            "id": chat.id,
+            "title": chat.title,
+            "type": chat.type,
+            "username": chat.username,
+            "description": getattr(chat, "description", None)
+        }
+        self._chat_info_cache[chat_id] = (now + self.chat_info_ttl, info)
+        return info
+        
+    async def get_group_info(self, bot, chat_id: int) -> Dict[str, Any]:
+        """
+        Get chat details together with the member count
+        
+        Args:
+            bot: Telegram bot instance
+            chat_id: Chat ID
+            
+        Returns:
+            Chat info including member_count
+        """
+        # Independent API calls, wait for both at once
+        info, member_count = await asyncio.gather(
+            self.get_chat_info(bot, chat_id),
+            self.get_member_count(bot, chat_id)
+        )
+        return {**info, "member_count": member_count}
+        
+    async def update_groups_info(self, bot, group_ids: List[int]) -> int:
+        """
+        Refresh title and member count of registered groups from Telegram
+        
+        Args:
+            bot: Telegram bot instance
+            group_ids: Group IDs to refresh
+            
+        Returns:
+            Number of groups updated
+        """
+        # Fetch everything concurrently, then queue one groups file write
+        infos = await asyncio.gather(*(self.get_group_info(bot, group_id) for group_id in group_ids))
+        
+        updated_at = datetime.now().isoformat()
+        updated = 0
+        for group_id, info in zip(group_ids, infos):
+            group = self.groups.get(str(group_id))
+            if group is None:
+                continue
+            if info.get("title"):
+                group["title"] = info["title"]
+            group["member_count"] = info["member_count"]
+            group["updated_at"] = updated_at
+            updated += 1
+            
+        if updated:
+            # Callers only need the in-memory refresh; the debounced save
+            # writes in the background and ShutdownManager's save phase
+            # awaits flush() (see register_flush in __init__) on exit
+            self._schedule_save()
+            self.logger.info(f"🔄 Refreshed info for {updated} groups")
+        return updated
+        
+    def adjust_member_count(self, chat_id: int, delta: int):
+        """
+        Adjust cached member count on join/leave without refetching
+        
+        Args:
+            chat_id: Chat ID
+            delta: Change in member count
+        """
+        cached = self._member_count_cache.get(chat_id)
+        if cached:
+            self._member_count_cache[chat_id] = (cached[0], max(0, cached[1] + delta))
+            
     async def update_group_setting(self, group_id: int, setting: str, 
                                  value: Any) -> bool:
         """
@@ -302,9 +495,9 @@ class GroupEngine:
         if stat_name.endswith("_today"):
             await self._check_daily_reset(group_id_str, group)
             
-        # Save changes
+        # Save changes (debounced, this runs on every message)
         self.groups[group_id_str] = group
-        await self._save_groups()
+        self._schedule_save()
         
         return True
         
@@ -3,14 +3,25 @@ Profile Engine - Handles user profile operations
 """
 
 import asyncio
+import heapq
 import logging
+import os
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from pathlib import Path
 import json
 
-from core.utils.time_utils import format_duration, get_account_age
+from core.utils.time_utils import get_account_age
 from core.utils.image_utils import download_profile_picture
+from shutdown import register_flush
+
+def _write_profiles_file(profiles_file: Path, data: str):
+    """Write to a temp file and swap it into place (runs in a thread)"""
+    profiles_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = profiles_file.with_suffix(".json.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_file, profiles_file)
 
 class ProfileEngine:
     """Engine for user profile management"""
@@ -20,6 +31,19 @@ class ProfileEngine:
         self.json_loader = json_loader
         self.user_profiles = {}
         self.profile_cache = {}
+        self.save_delay = 0.25
+        self._save_task: Optional[asyncio.Task] = None
+        # Set on every change, cleared when a write picks it up
+        self._dirty = False
+        # One profiles file write at a time (writes run in a worker thread)
+        self._save_lock = asyncio.Lock()
+        # Set by flush() to cut the debounce delay short
+        self._flush_event = asyncio.Event()
+        # Pending debounced saves are written out on shutdown
+        register_flush(self.flush)
+        
+        # Running aggregates for get_profile_stats (avoid full scans)
+        self._totals = {"messages": 0, "reputation": 0, "badges": 0, "active_users": 0}
         
     async def initialize(self):
         """Initialize profile engine"""
@@ -39,17 +63,71 @@ class ProfileEngine:
             self.logger.error(f"❌ Error loading user profiles: {e}")
             self.user_profiles = {}
             
-    async def _save_user_profiles(self):
-        """Save user profiles to storage"""
-        try:
-            profiles_file = Path("data/user_profiles.json")
-            profiles_file.parent.mkdir(parents=True, exist_ok=True)
+        self._recount_totals()
+        
+    def _recount_totals(self):
+        """Recompute running aggregates from all profiles"""
+        profiles = self.user_profiles.values()
+        self._totals = {
+            "messages": sum(p.get("message_count", 0) for p in profiles),
+            "reputation": sum(p.get("reputation", 0) for p in profiles),
+            "badges": sum(len(p.get("badges", [])) for p in profiles),
+            "active_users": sum(1 for p in profiles if p.get("message_count", 0) > 0)
+        }
             
-            with open(profiles_file, 'w', encoding='utf-8') as f:
-                json.dump(self.user_profiles, f, indent=2, ensure_ascii=False)
+    async def _save_user_profiles(self) -> bool:
+        """
+        Save user profiles to storage
+        
+        Returns:
+            True if the file was written
+        """
+        async with self._save_lock:
+            try:
+                profiles_file = Path("data/user_profiles.json")
                 
-        except Exception as e:
-            self.logger.error(f"❌ Error saving user profiles: {e}")
+                # Serialize on the loop so no handler mutates profiles mid-dump,
+                # then do the blocking write in a worker thread. Changes made
+                # during the write mark the engine dirty again.
+                self._dirty = False
+                data = json.dumps(self.user_profiles, indent=2, ensure_ascii=False)
+                await asyncio.to_thread(_write_profiles_file, profiles_file, data)
+                return True
+                    
+            except Exception as e:
+                self._dirty = True
+                self.logger.error(f"❌ Error saving user profiles: {e}")
+                return False
+            
+    def _schedule_save(self):
+        """Schedule a debounced save of user profiles"""
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._delayed_save())
+            
+    async def _delayed_save(self):
+        """Coalesce pending changes into as few writes as possible"""
+        # Keep going while changes arrive during a write; stop on failure
+        # and let the next change retry
+        while self._dirty:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.save_delay)
+            except asyncio.TimeoutError:
+                pass
+            if not await self._save_user_profiles():
+                break
+        
+    async def flush(self):
+        """Write pending changes and wait for any in-flight save"""
+        # Never cancel the save task, its write may already be running
+        # in a thread; wake it up and wait for it instead
+        if self._save_task and not self._save_task.done():
+            self._flush_event.set()
+            await self._save_task
+            self._flush_event.clear()
+        self._save_task = None
+        if self._dirty:
+            await self._save_user_profiles()
             
     async def get_user_profile(self, user_id: int, 
                              refresh: bool = False) -> Dict[str, Any]:
@@ -137,8 +215,8 @@ class ProfileEngine:
             "cached_at": datetime.now().timestamp()
         }
         
-        # Save to storage
-        await self._save_user_profiles()
+        # Save to storage (debounced)
+        self._schedule_save()
         
         self.logger.debug(f"📝 Updated profile for user {user_id}")
         return profile
@@ -158,7 +236,13 @@ class ProfileEngine:
             await self.update_user_profile(user_id, {"id": user_id})
             
         profile = self.user_profiles[user_id_str]
-        profile["message_count"] = profile.get("message_count", 0) + 1
+        previous_count = profile.get("message_count", 0)
+        profile["message_count"] = previous_count + 1
+        
+        # Update running aggregates
+        self._totals["messages"] += 1
+        if previous_count <= 0:
+            self._totals["active_users"] += 1
         profile["last_message_at"] = datetime.now().isoformat()
         
         # Update group-specific stats
@@ -180,9 +264,9 @@ class ProfileEngine:
         # Update rank based on message count
         await self._update_user_rank(user_id_str, profile)
         
-        # Save changes
+        # Save changes (debounced, this runs on every message)
         self.user_profiles[user_id_str] = profile
-        await self._save_user_profiles()
+        self._schedule_save()
         
     async def _update_user_rank(self, user_id_str: str, profile: Dict[str, Any]):
         """Update user rank based on activity"""
@@ -241,6 +325,7 @@ class ProfileEngine:
         
         # Ensure reputation doesn't go below 0
         profile["reputation"] = max(0, new_reputation)
+        self._totals["reputation"] += profile["reputation"] - current_reputation
         
         # Record reputation history
         rep_history = profile.get("reputation_history", [])
@@ -261,9 +346,9 @@ class ProfileEngine:
         # Update rank
         await self._update_user_rank(user_id_str, profile)
         
-        # Save changes
+        # Save changes (debounced)
         self.user_profiles[user_id_str] = profile
-        await self._save_user_profiles()
+        self._schedule_save()
         
         self.logger.info(f"⭐ User {user_id} reputation: {current_reputation} → {profile['reputation']} ({points} points)")
         
@@ -298,10 +383,11 @@ class ProfileEngine:
             
             badges.append(new_badge)
             profile["badges"] = badges
+            self._totals["badges"] += 1
             
             # Save changes
             self.user_profiles[user_id_str] = profile
-            await self._save_user_profiles()
+            self._schedule_save()
             
             self.logger.info(f"🎖️ Added badge '{badge_name}' to user {user_id}")
             
@@ -355,16 +441,20 @@ class ProfileEngine:
         Returns:
             List of top users
         """
+        # Select top profiles by score (O(N log K) instead of full sort)
+        top_profiles = heapq.nlargest(
+            limit,
+            self.user_profiles.items(),
+            key=lambda item: item[1].get(criteria, 0)
+        )
+        
         users_list = []
         
-        for user_id_str, profile in self.user_profiles.items():
+        for user_id_str, profile in top_profiles:
             try:
-                user_id = int(user_id_str)
-                score = profile.get(criteria, 0)
-                
                 users_list.append({
-                    "user_id": user_id,
-                    "score": score,
+                    "user_id": int(user_id_str),
+                    "score": profile.get(criteria, 0),
                     "name": f"{profile.get('first_name', '')} {profile.get('last_name', '')}".strip(),
                     "username": profile.get("username", ""),
                     "rank": profile.get("rank", "new")
@@ -372,10 +462,7 @@ class ProfileEngine:
             except:
                 continue
                 
-        # Sort by score
-        users_list.sort(key=lambda x: x["score"], reverse=True)
-        
-        return users_list[:limit]
+        return users_list
         
     async def generate_profile_card(self, user_id: int) -> Optional[str]:
         """
@@ -455,24 +542,23 @@ class ProfileEngine:
                 self.user_profiles[user_id_str] = minimal_profile
                 
         if inactive_users:
-            await self._save_user_profiles()
+            self._recount_totals()
+            self._schedule_save()
             self.logger.info(f"🧹 Cleaned up {len(inactive_users)} inactive profiles")
             
     async def get_profile_stats(self) -> Dict[str, Any]:
         """Get profile engine statistics"""
         total_users = len(self.user_profiles)
-        active_users = len([p for p in self.user_profiles.values() 
-                          if p.get("message_count", 0) > 0])
+        active_users = self._totals["active_users"]
                           
-        # Calculate average stats
-        total_messages = sum(p.get("message_count", 0) for p in self.user_profiles.values())
-        total_reputation = sum(p.get("reputation", 0) for p in self.user_profiles.values())
+        # Calculate average stats from running aggregates
+        total_messages = self._totals["messages"]
+        total_reputation = self._totals["reputation"]
         
         avg_messages = total_messages / total_users if total_users > 0 else 0
         avg_reputation = total_reputation / total_users if total_users > 0 else 0
         
-        # Count badges
-        total_badges = sum(len(p.get("badges", [])) for p in self.user_profiles.values())
+        total_badges = self._totals["badges"]
         
         return {
             "total_users": total_users,
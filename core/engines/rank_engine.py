@@ -3,6 +3,7 @@ Rank Engine - Handles user ranking and leveling system
 """
 
 import asyncio
+import bisect
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
@@ -16,6 +17,8 @@ class RankEngine:
         self.json_loader = json_loader
         self.rank_config = {}
         self.user_ranks = {}
+        self._level_thresholds: List[int] = []
+        self._level_numbers: List[int] = []
         
     async def initialize(self):
         """Initialize rank engine"""
@@ -71,6 +74,25 @@ class RankEngine:
             self.logger.error(f"❌ Error loading rank config: {e}")
             await self._create_default_config()
             
+        self._build_level_index()
+        
+    def _build_level_index(self):
+        """Build sorted min_xp thresholds for bisect level lookup"""
+        levels = self.rank_config.get("levels", {})
+        ordered = sorted(
+            (level_data.get("min_xp", 0), int(level_num))
+            for level_num, level_data in levels.items()
+        )
+        
+        self._level_thresholds = []
+        self._level_numbers = []
+        highest = 1
+        for min_xp, level_num in ordered:
+            # Keep "highest level reached" semantics for unordered configs
+            highest = max(highest, level_num)
+            self._level_thresholds.append(min_xp)
+            self._level_numbers.append(highest)
+            
     async def _create_default_config(self):
         """Create default rank configuration"""
         self.rank_config = {
@@ -220,15 +242,12 @@ class RankEngine:
         Returns:
             Level number
         """
-        levels = self.rank_config.get("levels", {})
-        
+        if not self._level_thresholds:
+            self._build_level_index()
+            
         # Find highest level where XP >= min_xp
-        max_level = 1
-        for level_num, level_data in levels.items():
-            if xp >= level_data.get("min_xp", 0):
-                max_level = max(max_level, level_num)
-                
-        return max_level
+        index = bisect.bisect_right(self._level_thresholds, xp) - 1
+        return self._level_numbers[index] if index >= 0 else 1
         
     async def _get_next_level_xp(self, current_xp: int) -> int:
         """
@@ -586,10 +605,13 @@ class RankEngine:
             return export_data
         elif format == "csv":
             # Convert to CSV format
-            csv_data = "user_id,level,xp,rank_name,messages_sent\n"
-            for user_id, rank in self.user_ranks.items():
-                csv_data += f"{user_id},{rank['level']},{rank['xp']},{rank['rank_name']},{rank['messages_sent']}\n"
-            return {"format": "csv", "data": csv_data}
+            # Collect rows and join once instead of growing one string per user
+            rows = ["user_id,level,xp,rank_name,messages_sent\n"]
+            rows.extend(
+                f"{user_id},{rank['level']},{rank['xp']},{rank['rank_name']},{rank['messages_sent']}\n"
+                for user_id, rank in self.user_ranks.items()
+            )
+            return {"format": "csv", "data": "".join(rows)}
         else:
             return {"error": "Unsupported format"}
             
@@ -609,6 +631,8 @@ class RankEngine:
                 
             if "rank_config" in data:
                 self.rank_config.update(data["rank_config"])
+                # Level thresholds may have changed, rebuild the bisect index
+                self._build_level_index()
                 
             self.logger.info(f"📥 Imported rank data for {len(data.get('user_ranks', {}))} users")
             return True
@@ -3,6 +3,7 @@ Stats Engine - Handles statistics and analytics
 """
 
 import asyncio
+import heapq
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -487,9 +488,8 @@ class StatsEngine:
             return {
                 "total_commands": len(all_commands),
                 "total_usage": sum(c["total_usage"] for c in all_commands.values()),
-                "commands": dict(sorted(all_commands.items(), 
-                                      key=lambda x: x[1]["total_usage"], 
-                                      reverse=True)[:20])  # Top 20
+                "commands": dict(heapq.nlargest(20, all_commands.items(), 
+                                                key=lambda x: x[1]["total_usage"]))  # Top 20
             }
             
     async def get_realtime_stats(self) -> Dict[str, Any]:
@@ -742,8 +742,7 @@ class StatsEngine:
                     "success_rate": stats.get("successful", 0) / stats.get("total_usage", 1) * 100
                 })
                 
-        top_commands.sort(key=lambda x: x["usage"], reverse=True)
-        return top_commands[:10]
+        return heapq.nlargest(10, top_commands, key=lambda x: x["usage"])
         
     def _generate_daily_insights(self, daily_stats: Dict[str, Any], 
                                hourly_stats: List[Dict[str, Any]]) -> List[str]:
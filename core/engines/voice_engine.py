@@ -3,12 +3,11 @@ Voice Engine - Handles voice generation and processing
 """
 
 import asyncio
+import hashlib
 import logging
 import os
 from typing import Dict, Any, Optional, BinaryIO
 from pathlib import Path
-from datetime import datetime
-import tempfile
 
 from gtts import gTTS
 import speech_recognition as sr
@@ -52,22 +51,31 @@ class VoiceEngine:
         if not text:
             return None
             
-        # Create cache key
-        cache_key = f"{hash(text)}_{language}_{voice_type}_{speed}_{emotion}"
+        # Create cache key (content addressed, stable across restarts)
+        cache_key = hashlib.sha1(
+            f"{text}|{language}|{voice_type}|{speed}|{emotion}".encode("utf-8")
+        ).hexdigest()
+        filename = f"voice_{cache_key}.mp3"
+        filepath = Path("data/cache/voice") / filename
         
-        # Check cache
-        if cache_key in self.voice_cache:
-            cached_file = self.voice_cache[cache_key]
-            if os.path.exists(cached_file):
-                self.logger.debug(f"🎵 Using cached voice: {cache_key}")
-                return cached_file
-                
+        # Check cache (file may also come from a previous run). Touching
+        # the file on a hit keeps _cleanup_voice_cache evicting the least
+        # recently used voices, not the oldest generated ones.
         try:
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"voice_{timestamp}_{hash(text) % 10000}.mp3"
-            filepath = Path("data/cache/voice") / filename
+            os.utime(filepath)
+            cached = True
+        except FileNotFoundError:
+            cached = False
+        except OSError:
+            # Can't bump mtime (e.g. read-only cache), still a hit
+            cached = filepath.exists()
             
+        if cached:
+            self.logger.debug(f"🎵 Using cached voice: {cache_key}")
+            self.voice_cache[cache_key] = str(filepath)
+            return str(filepath)
+                
+        try:
             # Create directory
             filepath.parent.mkdir(parents=True, exist_ok=True)
             
@@ -240,7 +248,7 @@ class VoiceEngine:
         if not cache_dir.exists():
             return
             
-        # Get all voice files sorted by modification time
+        # Get all voice files sorted by last use (mtime is bumped on cache hits)
         voice_files = sorted(cache_dir.glob("*.mp3"), 
                            key=lambda x: x.stat().st_mtime, 
                            reverse=True)
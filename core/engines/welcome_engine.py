@@ -6,12 +6,11 @@ import asyncio
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
-from pathlib import Path
-import json
 
 from core.utils.image_utils import create_welcome_image
 from core.utils.voice_utils import generate_welcome_voice
-from core.utils.time_utils import format_time, get_account_age
+from core.utils.time_utils import get_account_age
+from core.utils.string_utils import StringUtils
 
 class WelcomeEngine:
     """Engine for welcoming new members"""
@@ -22,7 +21,7 @@ class WelcomeEngine:
         self.welcome_cache = {}
         
     async def handle_new_member(self, user_data: Dict[str, Any], 
-                               group_data: Dict[str, Any]) -> Dict[str, Any]:
+                               group_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Handle new member welcome
         
@@ -31,13 +30,18 @@ class WelcomeEngine:
             group_data: Group information
             
         Returns:
-            Response data
+            Response data or None if welcome is disabled
         """
-        self.logger.info(f"👋 Welcoming new member: {user_data.get('username', 'Unknown')}")
-        
         # Load welcome configuration
         welcome_config = await self.json_loader.load("responses/welcome.json")
         
+        # Skip all work when welcome is disabled globally or for the group
+        if not welcome_config.get("enabled", True) or \
+                not group_data.get("settings", {}).get("welcome_enabled", True):
+            return None
+            
+        self.logger.info(f"👋 Welcoming new member: {user_data.get('username', 'Unknown')}")
+        
         # Prepare response
         response = {
             "engine": "welcome",
@@ -52,13 +56,13 @@ class WelcomeEngine:
         response["message"] = welcome_message
         
         # Generate welcome image if enabled
-        if welcome_config.get("image", True):
+        if welcome_config.get("image_enabled", welcome_config.get("image", True)):
             image_path = await self._generate_welcome_image(user_data, group_data, welcome_config)
             if image_path:
                 response["image"] = image_path
                 
         # Generate welcome voice if enabled
-        if welcome_config.get("voice", True):
+        if welcome_config.get("voice_enabled", welcome_config.get("voice", True)):
             voice_path = await self._generate_welcome_voice(welcome_message, user_data)
             if voice_path:
                 response["voice"] = voice_path
@@ -105,10 +109,7 @@ class WelcomeEngine:
         }
         
         # Replace variables in template
-        message = template
-        for key, value in variables.items():
-            placeholder = "{" + key + "}"
-            message = message.replace(placeholder, str(value))
+        message = StringUtils.format_template(template, variables)
             
         return message
         
@@ -0,0 +1,3 @@
+"""
+NOMI utilities
+"""
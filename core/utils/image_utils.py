@@ -3,7 +3,7 @@ Image Utilities - Image processing and manipulation
 """
 
 import asyncio
-from typing import Optional, Tuple, List, Dict, Any, BinaryIO
+from typing import Optional, Tuple, List, Dict, Any, BinaryIO, Union
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 import aiohttp
@@ -12,8 +12,32 @@ from io import BytesIO
 class ImageUtils:
     """Image processing utilities"""
     
-    @staticmethod
-    async def download_image(url: str, 
+    # Shared HTTP session, keeps connections alive between downloads
+    _session: Optional[aiohttp.ClientSession] = None
+    
+    @classmethod
+    def get_session(cls) -> aiohttp.ClientSession:
+        """
+        Get shared aiohttp session (created on first use)
+        
+        Returns:
+            aiohttp ClientSession
+        """
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=75)
+            )
+        return cls._session
+        
+    @classmethod
+    async def close_session(cls):
+        """Close shared aiohttp session"""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+        
+    @classmethod
+    async def download_image(cls, url: str, 
                            timeout: int = 10) -> Optional[BytesIO]:
         """
         Download image from URL
@@ -26,11 +50,11 @@ class ImageUtils:
             BytesIO object with image data or None
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=timeout) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        return BytesIO(content)
+            session = cls.get_session()
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status == 200:
+                    content = await response.read()
+                    return BytesIO(content)
         except Exception as e:
             print(f"Error downloading image from {url}: {e}")
             return None
@@ -9,9 +9,35 @@ from typing import List, Dict, Any, Optional, Tuple
 import unicodedata
 from difflib import SequenceMatcher
 
+class _TemplateVars(dict):
+    """Mapping for format_map that leaves unknown {placeholders} untouched"""
+    
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
 class StringUtils:
     """String manipulation utilities"""
     
+    @staticmethod
+    def format_template(template: str, variables: Dict[str, Any]) -> str:
+        """
+        Fill {placeholders} in a response template in a single pass
+        
+        Args:
+            template: Template text
+            variables: Placeholder values
+            
+        Returns:
+            Formatted text
+        """
+        try:
+            return template.format_map(_TemplateVars(variables))
+        except (ValueError, IndexError, AttributeError):
+            # Literal braces or {0}/{a.b} fields, fall back to plain replacement
+            for key, value in variables.items():
+                template = template.replace("{" + key + "}", str(value))
+            return template
+            
     @staticmethod
     def normalize_bangla_text(text: str) -> str:
         """Normalize Bangla text for consistent processing"""
@@ -4,17 +4,27 @@ Dispatcher - Dispatches events to engines
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
-from router import Router, EventType
+from typing import Dict, Any, Optional, Union
+from router import Router, EventType, MessageEvent
 
 class Dispatcher:
     """Dispatches events to appropriate engines"""
     
-    def __init__(self, router: Router):
+    def __init__(self, router: Router, event_timeout: float = 30.0,
+                 idle_timeout: float = 60.0, max_queue_size: int = 1000):
         self.logger = logging.getLogger("nomi_dispatcher")
         self.router = router
         self.engines = {}
-        self.event_queue = asyncio.Queue(maxsize=1000)
+        self.event_timeout = event_timeout
+        self.idle_timeout = idle_timeout
+        # Per-chat backlog limit, a flooded chat can't grow memory unbounded
+        self.max_queue_size = max_queue_size
+        self.dropped_events = 0
+        
+        # One queue + worker per chat: ordering inside a chat is kept,
+        # while different chats are processed concurrently
+        self._chat_queues: Dict[Any, asyncio.Queue] = {}
+        self._chat_workers: Dict[Any, asyncio.Task] = {}
         
     def register_engine(self, engine_name: str, engine):
         """Register an engine"""
@@ -24,10 +34,36 @@ class Dispatcher:
     async def start(self):
         """Start dispatcher"""
         self.logger.info("🚦 Starting dispatcher...")
-        # Start event processing task
-        asyncio.create_task(self._process_events())
+        # Chat workers are spawned lazily on first event of each chat
+        
+    async def stop(self):
+        """Stop all chat workers"""
+        workers = list(self._chat_workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._chat_workers.clear()
+        self._chat_queues.clear()
+        self.logger.info("🛑 Dispatcher stopped")
+        
+    def _chat_key(self, data: Union[MessageEvent, Dict[str, Any]]) -> Any:
+        """Get ordering key (chat id) for an event"""
+        if isinstance(data, MessageEvent):
+            return data.chat_id
+            
+        chat = data.get("chat")
+        if chat is not None:
+            return getattr(chat, "id", chat)
+            
+        callback_query = data.get("callback_query")
+        message = getattr(callback_query, "message", None)
+        if message is not None:
+            return message.chat_id
+            
+        return "global"
         
-    async def dispatch(self, event_type: EventType, data: Dict[str, Any]):
+    async def dispatch(self, event_type: EventType, 
+                       data: Union[MessageEvent, Dict[str, Any]]):
         """
         Dispatch an event
         
@@ -35,35 +71,76 @@ class Dispatcher:
             event_type: Type of event
             data: Event data
         """
+        chat_key = self._chat_key(data)
+        
+        # Put event in the chat queue
+        queue = self._chat_queues.get(chat_key)
+        if queue is None:
+            queue = self._chat_queues[chat_key] = asyncio.Queue(maxsize=self.max_queue_size)
         try:
-            # Put event in queue
-            await self.event_queue.put((event_type, data))
-            self.logger.debug(f"📤 Dispatched event: {event_type}")
+            queue.put_nowait((event_type, data))
         except asyncio.QueueFull:
-            self.logger.warning("⚠️ Event queue full, dropping event")
+            # Chat is flooding faster than it is processed, drop the event
+            self.dropped_events += 1
+            self.logger.warning(f"⚠️ Queue full for chat {chat_key}, dropped {event_type}")
+            return
+        
+        # Spawn worker for this chat if needed
+        worker = self._chat_workers.get(chat_key)
+        if worker is None or worker.done():
+            self._chat_workers[chat_key] = asyncio.create_task(
+                self._chat_worker(chat_key, queue)
+            )
             
-    async def _process_events(self):
-        """Process events from queue"""
-        self.logger.info("🔄 Event processor started")
+        self.logger.debug(f"📤 Dispatched event: {event_type}")
         
-        while True:
-            try:
-                # Get event from queue
-                event_type, data = await self.event_queue.get()
-                
-                # Route event
-                response = await self.router.route(event_type, data)
-                
-                if response:
-                    # Send to appropriate engine based on response
-                    await self._send_to_engine(response)
+    async def _chat_worker(self, chat_key: Any, queue: asyncio.Queue):
+        """
+        Process events of a single chat in order
+        
+        Args:
+            chat_key: Chat id the worker belongs to
+            queue: Event queue of the chat
+        """
+        try:
+            while True:
+                try:
+                    event_type, data = await asyncio.wait_for(
+                        queue.get(), timeout=self.idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    # Idle worker - release chat resources
+                    if queue.empty():
+                        break
+                    continue
                     
-                # Mark task as done
-                self.event_queue.task_done()
-                
-            except Exception as e:
-                self.logger.error(f"❌ Event processing error: {e}")
-                
+                try:
+                    await asyncio.wait_for(
+                        self._process_event(event_type, data),
+                        timeout=self.event_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"⏰ Event {event_type} timed out in chat {chat_key}")
+                except Exception as e:
+                    self.logger.error(f"❌ Event processing error: {e}")
+                finally:
+                    queue.task_done()
+        finally:
+            if self._chat_workers.get(chat_key) is asyncio.current_task():
+                del self._chat_workers[chat_key]
+                if queue.empty():
+                    self._chat_queues.pop(chat_key, None)
+                    
+    async def _process_event(self, event_type: EventType, 
+                             data: Union[MessageEvent, Dict[str, Any]]):
+        """Route a single event and pass the response on"""
+        # Route event
+        response = await self.router.route(event_type, data)
+        
+        if response:
+            # Send to appropriate engine based on response
+            await self._send_to_engine(response)
+            
     async def _send_to_engine(self, response: Dict[str, Any]):
         """Send response to appropriate engine"""
         engine_type = response.get("engine")
@@ -80,8 +157,12 @@ class Dispatcher:
             
     def get_queue_size(self) -> int:
         """Get current queue size"""
-        return self.event_queue.qsize()
+        return sum(queue.qsize() for queue in self._chat_queues.values())
+        
+    def get_active_chats(self) -> int:
+        """Get number of chats with a running worker"""
+        return len(self._chat_workers)
         
     def get_engine_names(self) -> list:
         """Get list of registered engines"""
-        return list(self.engines.keys())
\ No newline at end of file
+        return list(self.engines.keys())
@@ -23,9 +23,12 @@ class ErrorHandler:
         """Setup global exception handler"""
         sys.excepthook = self._global_exception_handler
         
-        # Setup asyncio exception handler
-        loop = asyncio.get_event_loop()
-        loop.set_exception_handler(self._async_exception_handler)
+        # Setup asyncio exception handler on the running loop
+        try:
+            loop = asyncio.get_running_loop()
+            loop.set_exception_handler(self._async_exception_handler)
+        except RuntimeError:
+            self.logger.warning("⚠️ No running event loop, asyncio handler not installed")
         
         self.logger.info("🛡️ Global error handler installed")
         
@@ -3,18 +3,21 @@ Event Listener - Listens for Telegram events
 """
 
 import logging
-from typing import Dict, Any, Callable
 from telegram import Update
-from telegram.ext import Application, ContextTypes
-from router import EventType
+from telegram.ext import (
+    Application, CallbackQueryHandler, ChatMemberHandler, CommandHandler,
+    ContextTypes, MessageHandler, filters
+)
+from router import EventType, MessageEvent
 
 class EventListener:
     """Listens for Telegram events"""
     
-    def __init__(self, token: str, dispatcher):
+    def __init__(self, token: str, dispatcher, concurrent_updates: int = 64):
         self.logger = logging.getLogger("nomi_listener")
         self.token = token
         self.dispatcher = dispatcher
+        self.concurrent_updates = concurrent_updates
         self.app = None
         self.handlers = {}
         
@@ -24,7 +27,13 @@ class EventListener:
         
         try:
             # Create application
-            self.app = Application.builder().token(self.token).build()
+            # Handlers only enqueue into the dispatcher, so let updates overlap
+            self.app = (
+                Application.builder()
+                .token(self.token)
+                .concurrent_updates(self.concurrent_updates)
+                .build()
+            )
             
             # Register handlers
             self._register_handlers()
@@ -38,48 +47,33 @@ class EventListener:
     def _register_handlers(self):
         """Register all Telegram handlers"""
         
-        # Message handler
-        async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-            await self._handle_message(update, context)
-        self.app.add_handler(telegram.ext.MessageHandler(
-            telegram.ext.filters.ALL, message_handler
-        ))
-        
-        # Command handler
-        async def command_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-            await self._handle_command(update, context)
-        self.app.add_handler(telegram.ext.CommandHandler(
-            "start", command_handler
-        ))
-        
-        # Callback query handler
-        async def callback_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-            await self._handle_callback(update, context)
-        self.app.add_handler(telegram.ext.CallbackQueryHandler(callback_handler))
-        
-        # New chat members handler
-        async def new_members_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-            await self._handle_new_members(update, context)
-        self.app.add_handler(telegram.ext.ChatMemberHandler(
-            new_members_handler, telegram.ext.ChatMemberHandler.CHAT_MEMBER
+        # Bound methods are passed directly instead of wrapper closures
+        self.app.add_handler(CommandHandler("start", self._handle_command))
+        self.app.add_handler(MessageHandler(filters.ALL, self._handle_message))
+        self.app.add_handler(CallbackQueryHandler(self._handle_callback))
+        self.app.add_handler(ChatMemberHandler(
+            self._handle_new_members, ChatMemberHandler.CHAT_MEMBER
         ))
         
         self.logger.info("📝 Registered all handlers")
         
     async def _handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle incoming messages"""
+        message = update.message
+        if not message:
+            return
+            
         try:
-            event_data = {
-                "type": EventType.MESSAGE,
-                "update": update,
-                "context": context,
-                "message": update.message,
-                "user": update.effective_user,
-                "chat": update.effective_chat,
-                "text": update.message.text if update.message else None
-            }
+            event = MessageEvent(
+                chat_id=message.chat_id,
+                user_id=message.from_user.id if message.from_user else None,
+                text=message.text,
+                message=message,
+                update=update,
+                context=context
+            )
             
-            await self.dispatcher.dispatch(EventType.MESSAGE, event_data)
+            await self.dispatcher.dispatch(EventType.MESSAGE, event)
             
         except Exception as e:
             self.logger.error(f"❌ Message handling error: {e}")
@@ -144,7 +138,11 @@ class EventListener:
         # Start polling
         await self.app.initialize()
         await self.app.start()
-        await self.app.updater.start_polling()
+        await self.app.updater.start_polling(
+            timeout=20,
+            allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY, Update.CHAT_MEMBER],
+            drop_pending_updates=True
+        )
         
         self.logger.info("✅ Event listener started")
         
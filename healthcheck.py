@@ -5,18 +5,17 @@ Healthcheck System - Monitors bot health (Production-ready Termux/Android)
 import time
 import psutil
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 from datetime import datetime
 import asyncio
 from dataclasses import dataclass
 from enum import Enum
-import sys
+
+from json_loader import read_json
 
 # Load config
 try:
-    import json
-    with open("config/bot.json", "r", encoding="utf-8") as f:
-        BOT_CONFIG = json.load(f)
+    BOT_CONFIG = read_json("config/bot.json")
 except:
     BOT_CONFIG = {}
 ENABLE_SYSTEM_METRICS = BOT_CONFIG.get("ENABLE_SYSTEM_METRICS", False)
@@ -59,38 +58,58 @@ class HealthMonitor:
         self.health_history: List[Dict] = []
         self.start_time = time.time()
         self.check_interval = 60  # seconds
-        self.monitoring = False
+        self._stop_event = asyncio.Event()
+        self._monitor_task = None
         
     async def start_monitoring(self):
         """Start health monitoring"""
-        if self.monitoring:
+        if self._monitor_task and not self._monitor_task.done():
             return
             
-        self.monitoring = True
+        self._stop_event.clear()
         self.logger.info("❤️ Starting health monitoring...")
         
         # Initial check
         await self.run_health_check()
         
         # Start periodic monitoring
-        asyncio.create_task(self._monitoring_loop())
+        self._monitor_task = asyncio.create_task(self._monitoring_loop())
         
     async def stop_monitoring(self):
         """Stop health monitoring"""
-        self.monitoring = False
+        # Wakes the monitoring loop immediately instead of after check_interval
+        self._stop_event.set()
+        if self._monitor_task:
+            await self._monitor_task
+            self._monitor_task = None
         self.logger.info("🛑 Stopping health monitoring")
         
+    async def _wait_or_stop(self, timeout: float) -> bool:
+        """
+        Sleep until timeout or stop request
+        
+        Returns:
+            True if stop was requested
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+            
     async def _monitoring_loop(self):
         """Monitoring loop"""
-        while self.monitoring:
+        while not self._stop_event.is_set():
             try:
                 await self.run_health_check()
-                await asyncio.sleep(self.check_interval)
+                if await self._wait_or_stop(self.check_interval):
+                    break
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"❌ Health monitoring error: {e}")
-                await asyncio.sleep(30)
+                if await self._wait_or_stop(30):
+                    break
                 
     async def run_health_check(self):
         """Run comprehensive health check"""
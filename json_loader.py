@@ -7,9 +7,56 @@ import asyncio
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import hashlib
 
+# orjson is optional, stdlib json is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def loads(data) -> Any:
+    """
+    Parse JSON from str or bytes (orjson when available)
+    
+    Args:
+        data: JSON document
+        
+    Returns:
+        Parsed JSON data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+    
+def dumps(data) -> str:
+    """
+    Serialize data to a compact JSON string (orjson when available)
+    
+    Args:
+        data: Data to serialize
+        
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, ensure_ascii=False, default=str)
+    
+def read_json(file_path) -> Any:
+    """
+    Read and parse a JSON file
+    
+    Args:
+        file_path: Path to JSON file
+        
+    Returns:
+        Parsed JSON data
+    """
+    with open(file_path, "rb") as f:
+        return loads(f.read())
+
 class JSONLoader:
     """Loads and manages JSON files with caching"""
     
@@ -46,8 +93,8 @@ class JSONLoader:
                 
             # Read file
             async with asyncio.Lock():
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(path, 'rb') as f:
+                    data = loads(f.read())
                     
             # Update cache
             self.cache[cache_key] = data.copy()
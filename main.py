@@ -1,11 +1,23 @@
 import asyncio
 import logging
-import json
+import os
+import re
+import signal
+import sys
+import socket
 from pathlib import Path
+from types import MappingProxyType
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.request import HTTPXRequest
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, CallbackQueryHandler, ContextTypes, filters
 
+from json_loader import read_json
+from core.utils.string_utils import StringUtils
+from core.engines.group_engine import GroupEngine
+from monitor import check_bot_health
+from shutdown import ShutdownManager
+
 # ===============================
 # Logging Setup
 # ===============================
@@ -15,62 +27,168 @@ logging.basicConfig(
 )
 logger = logging.getLogger("nomi_main")
 
+# httpx logs every request URL at INFO, and Bot API URLs contain the token
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
 # ===============================
 # Load Config
 # ===============================
 CONFIG_PATH = Path("config/bot.json")
 if not CONFIG_PATH.exists():
     logger.error("❌ bot.json config file missing!")
-    exit(1)
+    sys.exit(1)
 
-with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-    config = json.load(f)
+# Read-only view, loaded once at import
+config = MappingProxyType(read_json(CONFIG_PATH))
 
-BOT_TOKEN = config.get("token")
+# Credentials come from the environment first (docker-compose passes BOT_TOKEN)
+BOT_TOKEN = os.environ.get("BOT_TOKEN") or config.get("token")
 if not BOT_TOKEN:
-    logger.error("❌ Telegram token not found in config/bot.json")
-    exit(1)
+    logger.error("❌ Telegram token not found in BOT_TOKEN env or config/bot.json")
+    sys.exit(1)
+
+# Webhook mode (updates pushed through Nginx) instead of long polling
+USE_WEBHOOK = os.environ.get("USE_WEBHOOK", "").strip().lower() in ("1", "true", "yes", "on")
+PUBLIC_URL = os.environ.get("PUBLIC_URL", "").rstrip("/")
+if USE_WEBHOOK and not PUBLIC_URL:
+    logger.error("❌ USE_WEBHOOK is enabled but PUBLIC_URL is not set")
+    sys.exit(1)
 
 # ===============================
-# Load Response Files
+# Response Packs (loaded on demand)
 # ===============================
 RESPONSES_PATH = Path("responses")
 responses = {}
 
-for file in RESPONSES_PATH.glob("*.json"):
-    with open(file, "r", encoding="utf-8") as f:
-        responses[file.stem] = json.load(f)
-logger.info(f"✅ Response files loaded: {[f.stem for f in RESPONSES_PATH.glob('*.json')]}")
+async def load_pack(name: str) -> dict:
+    """Load a response pack once, parsing it off the event loop"""
+    pack = responses.get(name)
+    if pack is None:
+        try:
+            pack = await asyncio.to_thread(read_json, RESPONSES_PATH / f"{name}.json")
+        except FileNotFoundError:
+            pack = {}
+        except Exception as e:
+            logger.error(f"❌ Error loading response pack {name}: {e}")
+            pack = {}
+        responses[name] = pack
+    return pack
+
+# ===============================
+# Static Texts & Keyboards
+# ===============================
+HELP_TEXT = "এই বটে NOMI bot সাহায্য করবে!"
+INFO_TEXT = "NOMI Bot v1.0.0 | Developed by You"
+WELCOME_TMPL = "হ্যালো {username}, NOMI বটে স্বাগতম!"
+START_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("Help", callback_data="help")],
+    [InlineKeyboardButton("Info", callback_data="info")]
+])
+
+# Updates processed in parallel (PTB caps in-flight handlers at this number)
+CONCURRENT_UPDATES = int(os.environ.get("CONCURRENT_UPDATES", "64"))
+
+# Outgoing Bot API connections kept open (replies sent in parallel share this pool)
+CONNECTION_POOL_SIZE = int(os.environ.get("CONNECTION_POOL_SIZE", str(CONCURRENT_UPDATES)))
+
+# PID file read by monitor.py instead of scanning the process table
+PID_PATH = Path("run/nomi.pid")
+
+# Seconds between in-process health checks
+HEALTH_CHECK_INTERVAL = int(os.environ.get("HEALTH_CHECK_INTERVAL", "300"))
+
+# Group registry, loaded in main() (member join/leave updates keep it current)
+group_engine = GroupEngine(None)
+
+# Seconds between refreshes of registered groups' titles and member counts
+GROUP_REFRESH_INTERVAL = int(os.environ.get("GROUP_REFRESH_INTERVAL", "3600"))
+
+# Groups refreshed concurrently per batch (keeps clear of Bot API flood limits)
+GROUP_REFRESH_BATCH = 20
+
+# Only update types that have handlers registered below
+ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY]
+
+# Auto reply triggers, filled by preload_responses()
+AUTO_REPLY_ENABLED = False
+AUTO_REPLY_KEYWORDS = {}
+AUTO_REPLY_RE = None
+
+def build_auto_reply(pack: dict):
+    """Build lowercase keyword -> response table and its matching regex"""
+    keywords = {}
+    for entry in pack.get("patterns", {}).values():
+        if entry.get("response"):
+            for keyword in entry.get("patterns", []):
+                keywords.setdefault(keyword.lower(), entry["response"])
+
+    # All keywords in one regex (longest first so specific phrases win).
+    # No \b anchors: they don't work reliably with Bengali combining marks.
+    regex = re.compile(
+        "|".join(map(re.escape, sorted(keywords, key=len, reverse=True)))
+    ) if keywords else None
+    return keywords, regex
+
+async def preload_responses():
+    """Load the packs used by every handler before updates arrive"""
+    global WELCOME_TMPL, HELP_TEXT, AUTO_REPLY_ENABLED, AUTO_REPLY_KEYWORDS, AUTO_REPLY_RE
+    welcome_pack, help_pack, auto_pack = await asyncio.gather(
+        load_pack("welcome"), load_pack("help"), load_pack("auto_reply")
+    )
+    WELCOME_TMPL = welcome_pack.get("start", WELCOME_TMPL)
+    HELP_TEXT = help_pack.get("help", HELP_TEXT)
+    AUTO_REPLY_ENABLED = bool(auto_pack.get("enabled", True))
+    AUTO_REPLY_KEYWORDS, AUTO_REPLY_RE = build_auto_reply(auto_pack)
+    logger.info(f"✅ Response files loaded: {list(responses)}")
 
 # ===============================
 # Command Handlers
 # ===============================
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    username = update.effective_user.first_name
-    welcome_text = responses.get("welcome", {}).get("start", f"হ্যালো {username}, NOMI বটে স্বাগতম!")
-    # Example button
-    keyboard = [
-        [InlineKeyboardButton("Help", callback_data="help")],
-        [InlineKeyboardButton("Info", callback_data="info")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    await update.message.reply_text(welcome_text, reply_markup=reply_markup)
+    # Template resolved once in preload_responses(), one format call per /start
+    welcome_text = StringUtils.format_template(WELCOME_TMPL, {"username": update.effective_user.first_name})
+    await update.message.reply_text(welcome_text, reply_markup=START_KEYBOARD)
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    help_text = responses.get("help", {}).get("help", "এই বটে NOMI bot সাহায্য করবে!")
-    await update.message.reply_text(help_text)
+    await update.message.reply_text(HELP_TEXT)
 
 async def auto_reply(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    text = update.message.text.lower()
-    reply = None
-    # Simple keyword match from auto_reply.json
-    auto_data = responses.get("auto_reply", {})
-    for key, value in auto_data.items():
-        if key.lower() in text:
-            reply = value
-            break
-    if reply:
-        await update.message.reply_text(reply)
+    # Cheap checks first, nothing to do for non-text updates
+    message = update.message
+    if not AUTO_REPLY_ENABLED or AUTO_REPLY_RE is None or not message or not message.text:
+        return
+    # Single regex scan over all keywords from auto_reply.json
+    match = AUTO_REPLY_RE.search(message.text.lower())
+    if match:
+        await message.reply_text(AUTO_REPLY_KEYWORDS[match.group(0).lower()])
+
+# ===============================
+# Group Member Tracking
+# ===============================
+async def track_members(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Register groups on first sight and keep cached member counts current"""
+    message = update.message
+    chat = update.effective_chat
+    if not message or not chat:
+        return
+    if message.new_chat_members:
+        delta = len(message.new_chat_members)
+    elif message.left_chat_member:
+        delta = -1
+    else:
+        return
+
+    if str(chat.id) not in group_engine.groups:
+        # Chat details and member count fetched together (both cached),
+        # later joins/leaves only adjust the cached count
+        info = await group_engine.get_group_info(context.bot, chat.id)
+        await group_engine.register_group(chat.id, {
+            "title": info.get("title") or chat.title,
+            "type": info.get("type") or chat.type,
+            "member_count": info["member_count"]
+        })
+    else:
+        group_engine.adjust_member_count(chat.id, delta)
 
 # ===============================
 # CallbackQuery Handler (Buttons)
@@ -79,36 +197,166 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
     if query.data == "help":
-        help_text = responses.get("help", {}).get("help", "এই বটে NOMI bot সাহায্য করবে!")
-        await query.edit_message_text(help_text)
+        await query.edit_message_text(HELP_TEXT)
     elif query.data == "info":
-        await query.edit_message_text("NOMI Bot v1.0.0 | Developed by You")
+        await query.edit_message_text(INFO_TEXT)
+
+# ===============================
+# Health Check
+# ===============================
+async def health_loop(stop_event: asyncio.Event):
+    """Run check_bot_health periodically on the bot loop until stop is requested"""
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=HEALTH_CHECK_INTERVAL)
+        except asyncio.TimeoutError:
+            # psutil and file stats block, keep them off the event loop
+            try:
+                health_status = await asyncio.to_thread(check_bot_health)
+                if health_status["status"] != "healthy":
+                    logger.warning(f"⚠️ Health status: {health_status['status']} {health_status['issues']}")
+            except Exception as e:
+                logger.error(f"❌ Health check error: {e}")
+
+# ===============================
+# Group Info Refresh
+# ===============================
+async def group_refresh_loop(stop_event: asyncio.Event, bot):
+    """Refresh registered groups from Telegram periodically until stop is requested"""
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=GROUP_REFRESH_INTERVAL)
+        except asyncio.TimeoutError:
+            group_ids = [int(group_id) for group_id in group_engine.groups]
+            # Each batch is one concurrent fetch and one debounced groups file write
+            for i in range(0, len(group_ids), GROUP_REFRESH_BATCH):
+                if stop_event.is_set():
+                    break
+                try:
+                    await group_engine.update_groups_info(bot, group_ids[i:i + GROUP_REFRESH_BATCH])
+                except Exception as e:
+                    logger.error(f"❌ Group refresh error: {e}")
 
 # ===============================
 # Main Function
 # ===============================
 async def main():
-    # Build application
-    application = ApplicationBuilder().token(BOT_TOKEN).build()
+    # Load response packs needed by the handlers
+    await preload_responses()
+    await group_engine.initialize()
+
+    # Resolve api.telegram.org once so the first connections skip the lookup
+    try:
+        await asyncio.to_thread(socket.getaddrinfo, "api.telegram.org", 443)
+    except OSError as e:
+        logger.warning(f"⚠️ DNS warm-up failed: {e}")
+
+    # Build application (pool sized for concurrent handlers, getUpdates on its own connection)
+    application = (
+        ApplicationBuilder()
+        .token(BOT_TOKEN)
+        .concurrent_updates(CONCURRENT_UPDATES)
+        .request(HTTPXRequest(
+            connection_pool_size=CONNECTION_POOL_SIZE,
+            pool_timeout=1.0,
+            connect_timeout=5.0,
+            read_timeout=30.0,
+            write_timeout=30.0
+        ))
+        .get_updates_request(HTTPXRequest(read_timeout=30.0))
+        .build()
+    )
 
     # Register handlers
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, auto_reply))
+    application.add_handler(MessageHandler(
+        filters.ChatType.GROUPS & (filters.StatusUpdate.NEW_CHAT_MEMBERS | filters.StatusUpdate.LEFT_CHAT_MEMBER),
+        track_members
+    ))
     application.add_handler(CallbackQueryHandler(button_handler))
 
     # Start the bot
     logger.info("🤖 NOMI is ONLINE")
     await application.initialize()
-    await application.start()
-    await application.updater.start_polling()
-    await application.run_polling()  # Keeps running until Ctrl+C
+    stop_event = asyncio.Event()
+    health_task = None
+    refresh_task = None
+
+    # Everything after initialize() is guarded so a failed start still shuts down
+    try:
+        await application.start()
+        if USE_WEBHOOK:
+            # Push delivery through Nginx (location /webhook -> 127.0.0.1:8443)
+            await application.updater.start_webhook(
+                listen=os.environ.get("WEBHOOK_LISTEN", "127.0.0.1"),
+                port=int(os.environ.get("PORT", "8443")),
+                url_path="webhook",
+                webhook_url=f"{PUBLIC_URL}/webhook",
+                secret_token=os.environ.get("WEBHOOK_SECRET"),
+                allowed_updates=ALLOWED_UPDATES,
+                drop_pending_updates=True
+            )
+            logger.info("🌐 Webhook mode enabled")
+        else:
+            # Long poll (fewer getUpdates round trips) and only handled update types
+            await application.updater.start_polling(
+                timeout=20,
+                allowed_updates=ALLOWED_UPDATES,
+                drop_pending_updates=True
+            )
+
+        # Record our PID for the external health monitor
+        PID_PATH.parent.mkdir(parents=True, exist_ok=True)
+        PID_PATH.write_text(str(os.getpid()))
+
+        # Keep running until stop is requested (no periodic wakeups)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except NotImplementedError:
+                # Windows: no loop signal handlers, hand over to the loop safely
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(stop_event.set))
+
+        # Health checks share this loop instead of a separate monitor process
+        health_task = asyncio.create_task(health_loop(stop_event))
+        refresh_task = asyncio.create_task(group_refresh_loop(stop_event, application.bot))
+
+        await stop_event.wait()
+    finally:
+        logger.info("🛑 Stopping NOMI...")
+        stop_event.set()
+        if health_task is not None:
+            await health_task
+        if refresh_task is not None:
+            await refresh_task
+        if application.updater.running:
+            await application.updater.stop()
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+        # Write out debounced saves and buffered logs before exiting
+        await ShutdownManager().execute()
+        PID_PATH.unlink(missing_ok=True)
 
 # ===============================
 # Run
 # ===============================
 if __name__ == "__main__":
+    # Use uvloop when available (not supported on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            # uvloop.run creates the loop directly (no global policy swap)
+            logger.info("⚡ uvloop event loop enabled")
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except (KeyboardInterrupt, SystemExit):
         logger.info("👋 Bot stopped")
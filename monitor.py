@@ -2,12 +2,48 @@
 Monitoring script for bot health and performance
 """
 
-import json
+import logging
 import os
 import psutil
 import time
 from datetime import datetime
-import requests
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from json_loader import dumps
+
+# Diagnostics, also used when check_bot_health runs inside the bot process
+logger = logging.getLogger("nomi_monitor")
+
+# Written by main.py at startup, holds the bot's PID
+PID_FILE = Path("run/nomi.pid")
+
+# Prime psutil's CPU counters so later cpu_percent(interval=None) calls
+# return the usage since the previous check without blocking
+psutil.cpu_percent(interval=None)
+
+# System probes change slowly, reuse results for this many seconds
+PROBE_TTL = 30
+_probe_cache = {}
+
+def _cached_probe(name, probe):
+    """
+    Return a cached psutil probe result, refreshing it after PROBE_TTL
+    
+    Args:
+        name: Cache key
+        probe: Zero-argument function doing the actual probe
+        
+    Returns:
+        Probe result
+    """
+    now = time.monotonic()
+    cached = _probe_cache.get(name)
+    if cached and cached[0] > now:
+        return cached[1]
+    value = probe()
+    _probe_cache[name] = (now + PROBE_TTL, value)
+    return value
 
 def check_bot_health():
     """Check bot health status"""
@@ -19,18 +55,14 @@ def check_bot_health():
     }
     
     try:
-        # Check if bot process is running
-        bot_running = False
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if 'python' in proc.info['name'].lower():
-                    cmdline = ' '.join(proc.info['cmdline'] or [])
-                    if 'main.py' in cmdline or 'run.py' in cmdline:
-                        bot_running = True
-                        health_status["metrics"]["bot_pid"] = proc.info['pid']
-                        break
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        # Check if bot process is running (PID file, no process table scan)
+        try:
+            pid = int(PID_FILE.read_text())
+            bot_running = psutil.pid_exists(pid)
+            if bot_running:
+                health_status["metrics"]["bot_pid"] = pid
+        except (FileNotFoundError, ValueError):
+            bot_running = False
         
         health_status["metrics"]["bot_running"] = bot_running
         
@@ -39,7 +71,7 @@ def check_bot_health():
             health_status["issues"].append("Bot process not running")
         
         # Check disk space
-        disk_usage = psutil.disk_usage('/')
+        disk_usage = _cached_probe("disk", lambda: psutil.disk_usage('/'))
         health_status["metrics"]["disk_usage_percent"] = disk_usage.percent
         health_status["metrics"]["disk_free_gb"] = disk_usage.free / (1024**3)
         
@@ -48,22 +80,19 @@ def check_bot_health():
             health_status["issues"].append("Disk space running low")
         
         # Check memory usage
-        memory = psutil.virtual_memory()
+        memory = _cached_probe("memory", psutil.virtual_memory)
         health_status["metrics"]["memory_usage_percent"] = memory.percent
         
         if memory.percent > 85:
             health_status["status"] = "warning"
             health_status["issues"].append("High memory usage")
         
-        # Check CPU usage
+        # Check CPU usage (non-blocking, measured since the previous call)
         try:
-            cpu = psutil.cpu_percent()
-            ram = psutil.virtual_memory().percent
+            health_status["metrics"]["cpu_usage_percent"] = psutil.cpu_percent(interval=None)
         except PermissionError:
-            cpu = None
-            ram = None
-            logger.warning("⚠️ CPU/RAM metrics unavailable (Termux restricted)")
-    
+            logger.warning("⚠️ CPU metrics unavailable (Termux restricted)")
+        
         # Check database files
         db_files = [
             "db/users.json",
@@ -73,10 +102,11 @@ def check_bot_health():
         ]
         
         for db_file in db_files:
-            if os.path.exists(db_file):
-                size_mb = os.path.getsize(db_file) / (1024*1024)
+            # One stat call covers both the existence and the size check
+            try:
+                size_mb = os.stat(db_file).st_size / (1024*1024)
                 health_status["metrics"][f"db_{db_file.split('/')[-1]}_size_mb"] = size_mb
-            else:
+            except FileNotFoundError:
                 health_status["status"] = "warning"
                 health_status["issues"].append(f"Database file missing: {db_file}")
         
@@ -97,21 +127,48 @@ def send_alert(health_status):
     """Send alert if bot is unhealthy"""
     if health_status["status"] in ["unhealthy", "error"]:
         # Send Telegram alert to admins
-        message = f"⚠️ **বট হেলথ অ্যালার্ট**\n\n"
-        message += f"স্ট্যাটাস: {health_status['status']}\n"
-        message += f"সময়: {health_status['timestamp']}\n\n"
+        parts = [
+            "⚠️ **বট হেলথ অ্যালার্ট**\n\n",
+            f"স্ট্যাটাস: {health_status['status']}\n",
+            f"সময়: {health_status['timestamp']}\n\n"
+        ]
         
         if health_status["issues"]:
-            message += "**ইস্যুসমূহ:**\n"
-            for issue in health_status["issues"]:
-                message += f"• {issue}\n"
+            parts.append("**ইস্যুসমূহ:**\n")
+            parts.extend(f"• {issue}\n" for issue in health_status["issues"])
+        message = "".join(parts)
         
         # Here you would send the message via Telegram
         print(f"ALERT: {message}")
 
+def get_health_logger():
+    """
+    Build the health log writer (one open handle, rotated by size)
+    
+    Returns:
+        Logger writing one JSON record per line
+    """
+    os.makedirs("logs", exist_ok=True)
+    handler = RotatingFileHandler(
+        "logs/health_monitor.log",
+        maxBytes=10 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    # Child of the module logger that doesn't propagate, so the file only
+    # holds health records
+    health_logger = logging.getLogger("nomi_monitor.health")
+    health_logger.setLevel(logging.INFO)
+    health_logger.propagate = False
+    health_logger.addHandler(handler)
+    return health_logger
+
 def main():
     """Main monitoring loop"""
     print("🔍 Starting bot monitor...")
+    health_logger = get_health_logger()
     
     while True:
         try:
@@ -129,10 +186,8 @@ def main():
             # Send alert if needed
             send_alert(health_status)
             
-            # Save to log file
-            log_file = "logs/health_monitor.log"
-            with open(log_file, 'a') as f:
-                f.write(json.dumps(health_status) + '\n')
+            # Save to log file (NDJSON)
+            health_logger.info(dumps(health_status))
             
             # Wait before next check
             time.sleep(300)  # 5 minutes
@@ -143,6 +198,9 @@ def main():
         except Exception as e:
             print(f"❌ Monitoring error: {e}")
             time.sleep(60)
+    
+    # Flush and close the log handle
+    logging.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -2,7 +2,9 @@
 Permission Manager - Manages user and group permissions
 """
 
+import heapq
 import logging
+import time
 from typing import Dict, Any, List, Optional, Set
 from enum import Enum
 from dataclasses import dataclass
@@ -18,7 +20,10 @@ class PermissionLevel(Enum):
     SUPER_ADMIN = 5
     OWNER = 6
 
-@dataclass
+# Plain dict lookups, cheaper than the Enum .value descriptor on hot checks
+_LEVEL_VALUE = {level: level.value for level in PermissionLevel}
+
+@dataclass(slots=True)
 class UserPermission:
     """User permission data"""
     user_id: int
@@ -28,7 +33,7 @@ class UserPermission:
     expires_at: Optional[float] = None
     reason: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class GroupPermission:
     """Group permission data"""
     group_id: int
@@ -39,10 +44,17 @@ class GroupPermission:
 class PermissionManager:
     """Manages permissions system"""
     
+    # Features enabled for groups without their own settings
+    _DEFAULT_ENABLED = frozenset({"welcome", "goodbye", "auto_reply"})
+    
     def __init__(self):
         self.logger = logging.getLogger("nomi_permission")
         self.user_permissions: Dict[int, UserPermission] = {}
         self.group_permissions: Dict[int, GroupPermission] = {}
+        # Expiry is relative time, monotonic clock needs no event loop lookup
+        self._now = time.monotonic
+        # (expires_at, user_id) min-heap of time-limited permissions
+        self._expiry_heap: List[tuple] = []
         self.default_permissions = {
             PermissionLevel.USER: {
                 "can_send_messages": True,
@@ -74,6 +86,27 @@ class PermissionManager:
                 "can_view_admin_stats": True
             }
         }
+        self._allowed = self._build_allowed_table()
+        
+    def _build_allowed_table(self) -> frozenset:
+        """
+        Flatten default_permissions into allowed (level_value, action) pairs
+        
+        Each level also gets every action allowed to the levels below it,
+        so SUPER_ADMIN and OWNER inherit ADMIN. BANNED gets nothing.
+        
+        Returns:
+            Frozenset of allowed pairs
+        """
+        allowed = set()
+        inherited = set()
+        for level in sorted(PermissionLevel, key=lambda lvl: lvl.value):
+            if level == PermissionLevel.BANNED:
+                continue
+            permissions = self.default_permissions.get(level, {})
+            inherited.update(action for action, ok in permissions.items() if ok)
+            allowed.update((level.value, action) for action in inherited)
+        return frozenset(allowed)
         
     async def initialize(self):
         """Initialize permission manager"""
@@ -101,16 +134,18 @@ class PermissionManager:
         Returns:
             Permission level
         """
-        if user_id in self.user_permissions:
-            perm = self.user_permissions[user_id]
-            # Check if expired
-            if perm.expires_at and perm.expires_at < asyncio.get_event_loop().time():
-                # Permission expired, revert to USER
-                del self.user_permissions[user_id]
-                return PermissionLevel.USER
-            return perm.permission_level
+        # Single dict lookup, most users have no stored permission
+        perm = self.user_permissions.get(user_id)
+        if perm is None:
+            return PermissionLevel.USER
             
-        return PermissionLevel.USER
+        # Only time-limited permissions need the clock
+        expires_at = perm.expires_at
+        if expires_at and expires_at < self._now():
+            # Permission expired, revert to USER
+            del self.user_permissions[user_id]
+            return PermissionLevel.USER
+        return perm.permission_level
         
     def set_user_permission(self, user_id: int, level: PermissionLevel, 
                            granted_by: Optional[int] = None, duration: Optional[int] = None,
@@ -125,20 +160,23 @@ class PermissionManager:
             duration: Duration in seconds (None for permanent)
             reason: Reason for permission change
         """
+        now = self._now()
         expires_at = None
         if duration:
-            expires_at = asyncio.get_event_loop().time() + duration
+            expires_at = now + duration
             
         permission = UserPermission(
             user_id=user_id,
             permission_level=level,
             granted_by=granted_by,
-            granted_at=asyncio.get_event_loop().time(),
+            granted_at=now,
             expires_at=expires_at,
             reason=reason
         )
         
         self.user_permissions[user_id] = permission
+        if expires_at:
+            heapq.heappush(self._expiry_heap, (expires_at, user_id))
         self.logger.info(f"📝 Set permission for user {user_id}: {level.name}")
         
         # Save changes
@@ -155,8 +193,7 @@ class PermissionManager:
         Returns:
             True if user has permission
         """
-        user_level = self.get_user_permission(user_id)
-        return user_level.value >= required_level.value
+        return _LEVEL_VALUE[self.get_user_permission(user_id)] >= _LEVEL_VALUE[required_level]
         
     def can_perform_action(self, user_id: int, action: str) -> bool:
         """
@@ -169,13 +206,8 @@ class PermissionManager:
         Returns:
             True if allowed
         """
-        user_level = self.get_user_permission(user_id)
-        
-        if user_level in self.default_permissions:
-            permissions = self.default_permissions[user_level]
-            return permissions.get(action, False)
-            
-        return False
+        # One set membership test against the precomputed table
+        return (_LEVEL_VALUE[self.get_user_permission(user_id)], action) in self._allowed
         
     def get_group_permission(self, group_id: int) -> GroupPermission:
         """
@@ -193,7 +225,7 @@ class PermissionManager:
         # Return default
         return GroupPermission(
             group_id=group_id,
-            enabled_features=set(["welcome", "goodbye", "auto_reply"]),
+            enabled_features=set(self._DEFAULT_ENABLED),
             disabled_features=set(),
             restrictions={}
         )
@@ -241,8 +273,12 @@ class PermissionManager:
         Returns:
             True if enabled
         """
-        group_perm = self.get_group_permission(group_id)
+        group_perm = self.group_permissions.get(group_id)
         
+        # Unregistered group, answer from the defaults without building an object
+        if group_perm is None:
+            return feature in self._DEFAULT_ENABLED
+            
         if feature in group_perm.disabled_features:
             return False
             
@@ -250,8 +286,7 @@ class PermissionManager:
             return True
             
         # Default enabled features
-        default_enabled = {"welcome", "goodbye", "auto_reply"}
-        return feature in default_enabled
+        return feature in self._DEFAULT_ENABLED
         
     def ban_user(self, user_id: int, reason: str = "", duration: Optional[int] = None):
         """Ban a user"""
@@ -308,7 +343,7 @@ class PermissionManager:
                 "granted_at": perm.granted_at,
                 "expires_at": perm.expires_at,
                 "reason": perm.reason,
-                "is_expired": perm.expires_at and perm.expires_at < asyncio.get_event_loop().time()
+                "is_expired": perm.expires_at and perm.expires_at < self._now()
             }
         else:
             return {
@@ -320,15 +355,17 @@ class PermissionManager:
             
     def cleanup_expired(self):
         """Cleanup expired permissions"""
-        current_time = asyncio.get_event_loop().time()
-        expired = []
+        current_time = self._now()
+        expired = 0
         
-        for user_id, perm in self.user_permissions.items():
-            if perm.expires_at and perm.expires_at < current_time:
-                expired.append(user_id)
+        # Only visit entries whose deadline has passed
+        while self._expiry_heap and self._expiry_heap[0][0] < current_time:
+            expires_at, user_id = heapq.heappop(self._expiry_heap)
+            perm = self.user_permissions.get(user_id)
+            # Skip stale entries (permission replaced or already removed)
+            if perm and perm.expires_at == expires_at:
+                del self.user_permissions[user_id]
+                expired += 1
                 
-        for user_id in expired:
-            del self.user_permissions[user_id]
-            
         if expired:
-            self.logger.info(f"🧹 Cleaned up {len(expired)} expired permissions")
\ No newline at end of file
+            self.logger.info(f"🧹 Cleaned up {expired} expired permissions")
\ No newline at end of file
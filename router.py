@@ -3,7 +3,8 @@ Router - Routes events to appropriate handlers
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+from dataclasses import dataclass
 from enum import Enum
 
 class EventType(Enum):
@@ -21,6 +22,16 @@ class EventType(Enum):
     COMMAND = "command"
     ERROR = "error"
 
+@dataclass(slots=True, frozen=True)
+class MessageEvent:
+    """Message event data (slotted, cheaper than a per-message dict)"""
+    chat_id: int
+    user_id: Optional[int]
+    text: Optional[str]
+    message: Any
+    update: Any
+    context: Any
+
 class Router:
     """Routes events to handlers"""
     
@@ -28,20 +39,26 @@ class Router:
         self.logger = logging.getLogger("nomi_router")
         self.handlers = {}
         self.middlewares = []
+        # Immutable snapshots read by route(), rebuilt on registration
+        self._handler_tuples: Dict[EventType, tuple] = {}
+        self._middleware_tuple: tuple = ()
         
     def register_handler(self, event_type: EventType, handler):
         """Register an event handler"""
         if event_type not in self.handlers:
             self.handlers[event_type] = []
         self.handlers[event_type].append(handler)
-        self.logger.debug(f"Registered handler for {event_type}")
+        self._handler_tuples[event_type] = tuple(self.handlers[event_type])
+        self.logger.debug("Registered handler for %s", event_type)
         
     def register_middleware(self, middleware):
         """Register middleware"""
         self.middlewares.append(middleware)
-        self.logger.debug(f"Registered middleware: {middleware.__class__.__name__}")
+        self._middleware_tuple = tuple(self.middlewares)
+        self.logger.debug("Registered middleware: %s", middleware.__class__.__name__)
         
-    async def route(self, event_type: EventType, data: Dict[str, Any]) -> Optional[Dict]:
+    async def route(self, event_type: EventType, 
+                    data: Union[MessageEvent, Dict[str, Any]]) -> Optional[Dict]:
         """
         Route an event to appropriate handlers
         
@@ -52,22 +69,34 @@ class Router:
         Returns:
             Response data or None
         """
-        self.logger.debug(f"📨 Routing event: {event_type}")
+        # Don't build debug messages when DEBUG is off (production)
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug("📨 Routing event: %s", event_type.value)
         
         # Apply middlewares
-        for middleware in self.middlewares:
+        for middleware in self._middleware_tuple:
             data = await middleware.process(data)
             if data is None:
-                self.logger.debug("Middleware blocked event")
+                if debug:
+                    self.logger.debug("Middleware blocked event")
                 return None
                 
         # Get handlers for event type
-        handlers = self.handlers.get(event_type, [])
+        handlers = self._handler_tuples.get(event_type)
         
         if not handlers:
             self.logger.warning(f"No handler for event type: {event_type}")
             return None
             
+        # Fast path: single handler, no response list or merge
+        if len(handlers) == 1:
+            try:
+                return await handlers[0](data) or None
+            except Exception as e:
+                self.logger.error(f"Handler error: {e}")
+                return None
+                
         # Execute handlers
         responses = []
         for handler in handlers:
@@ -88,11 +117,8 @@ class Router:
         return None
         
     def _merge_responses(self, responses: List[Dict]) -> Dict:
-        """Merge multiple responses"""
-        merged = {}
-        for response in responses:
-            merged.update(response)
-        return merged
+        """Merge multiple responses (later handlers win on key clashes)"""
+        return {key: value for response in responses for key, value in response.items()}
         
     def get_handler_count(self) -> Dict[EventType, int]:
         """Get count of handlers per event type"""
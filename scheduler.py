@@ -3,13 +3,25 @@ Scheduler - Manages scheduled tasks and events
 """
 
 import asyncio
+import heapq
+import itertools
 import logging
+import os
 from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime, timedelta
+from datetime import datetime
 import time
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
-import json
+
+from json_loader import dumps, read_json
+
+def _atomic_write(path: str, data: str):
+    """Write text to a temp file and swap it into place"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
 
 class TaskType(Enum):
     """Task types"""
@@ -20,7 +32,7 @@ class TaskType(Enum):
     REPORT = "report"
     CUSTOM = "custom"
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledTask:
     """Scheduled task data"""
     task_id: str
@@ -40,7 +52,29 @@ class Scheduler:
         self.logger = logging.getLogger("nomi_scheduler")
         self.tasks: Dict[str, ScheduledTask] = {}
         self.running = False
-        self.task_queue = asyncio.PriorityQueue()
+        # (deadline_ns, seq, task) min-heap on the monotonic clock, so wall
+        # clock jumps (NTP) don't fire tasks early or late; stale entries
+        # are skipped on pop
+        self._heap: List[tuple] = []
+        self._heap_seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task_counter = itertools.count()
+        # Task type -> handler, built once instead of an if/elif chain per task
+        self._type_handlers = {
+            TaskType.REMINDER: self._handle_reminder,
+            TaskType.MESSAGE: self._handle_message,
+            TaskType.CLEANUP: self._handle_cleanup,
+            TaskType.BACKUP: self._handle_backup,
+            TaskType.REPORT: self._handle_report
+        }
+        # Mutations only mark the tasks dirty, one write per save_delay
+        self._dirty = False
+        self.save_delay = 30
+        self._save_task: Optional[asyncio.Task] = None
+        # One tasks file write at a time (writes run in a worker thread)
+        self._save_lock = asyncio.Lock()
+        # Set by stop() to cut the debounce delay short
+        self._flush_event = asyncio.Event()
         self.worker_task = None
         
     async def start(self):
@@ -74,51 +108,98 @@ class Scheduler:
             except asyncio.CancelledError:
                 pass
                 
-        # Save tasks
+        # Never cancel the pending save, its write may already be running
+        # in a thread; wake it up and wait for it, then write everything
+        if self._save_task and not self._save_task.done():
+            self._flush_event.set()
+            await self._save_task
+            self._flush_event.clear()
+        self._save_task = None
         await self._save_tasks()
         
         self.logger.info("✅ Scheduler stopped")
         
+    def _mark_dirty(self):
+        """Flag unsaved changes and schedule a debounced save"""
+        self._dirty = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._delayed_save())
+            
+    async def _delayed_save(self):
+        """Coalesce pending changes into as few writes as possible"""
+        # Keep going while changes arrive during a write; stop on failure
+        # and let the next change retry
+        while self._dirty:
+            try:
+                await asyncio.wait_for(self._flush_event.wait(), timeout=self.save_delay)
+            except asyncio.TimeoutError:
+                pass
+            if not await self._save_tasks():
+                break
+            
+    def _heap_entry(self, task: ScheduledTask) -> tuple:
+        """Anchor the task's wall-clock execute_at to a monotonic deadline"""
+        deadline_ns = time.monotonic_ns() + int((task.execute_at - time.time()) * 1_000_000_000)
+        return (deadline_ns, next(self._heap_seq), task)
+        
+    def _push(self, task: ScheduledTask):
+        """Add task deadline to the heap and wake the worker"""
+        heapq.heappush(self._heap, self._heap_entry(task))
+        self._wakeup.set()
+        
     async def _worker(self):
         """Worker that processes tasks"""
         self.logger.info("👷 Scheduler worker started")
         
         while self.running:
             try:
-                # Check for due tasks every second
-                current_time = time.time()
+                # Sleep until the next deadline or until a task is added
+                if not self._heap:
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
+                    
+                delay = (self._heap[0][0] - time.monotonic_ns()) / 1_000_000_000
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
+                    
+                entry = heapq.heappop(self._heap)
                 
-                for task_id, task in list(self.tasks.items()):
-                    if task.execute_at <= current_time:
-                        # Execute task
-                        await self._execute_task(task)
-                        
-                        # Handle repetition
-                        if task.repeat_interval:
-                            # Reschedule
-                            new_execute_at = current_time + task.repeat_interval
-                            new_task = ScheduledTask(
-                                task_id=task_id,
-                                task_type=task.task_type,
-                                execute_at=new_execute_at,
-                                data=task.data,
-                                callback=task.callback,
-                                repeat_interval=task.repeat_interval,
-                                created_at=task.created_at,
-                                created_by=task.created_by,
-                                group_id=task.group_id
-                            )
-                            self.tasks[task_id] = new_task
-                        else:
-                            # Remove one-time task
-                            del self.tasks[task_id]
-                            
-                # Save tasks periodically
-                if int(current_time) % 60 == 0:  # Every minute
-                    await self._save_tasks()
+                # Skip cancelled or rescheduled tasks (lazy deletion)
+                task = self._live_task(entry)
+                if task is None:
+                    continue
+                task_id = task.task_id
                     
-                await asyncio.sleep(1)
+                # Execute task
+                await self._execute_task(task)
                 
+                # Handle repetition
+                if task.repeat_interval:
+                    # Reschedule
+                    new_task = ScheduledTask(
+                        task_id=task_id,
+                        task_type=task.task_type,
+                        execute_at=time.time() + task.repeat_interval,
+                        data=task.data,
+                        callback=task.callback,
+                        repeat_interval=task.repeat_interval,
+                        created_at=task.created_at,
+                        created_by=task.created_by,
+                        group_id=task.group_id
+                    )
+                    self.tasks[task_id] = new_task
+                    self._push(new_task)
+                elif self.tasks.get(task_id) is task:
+                    # Remove one-time task
+                    del self.tasks[task_id]
+                self._mark_dirty()
+                    
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -130,26 +211,22 @@ class Scheduler:
         self.logger.info(f"⚡ Executing task: {task.task_id} ({task.task_type.value})")
         
         try:
+            # Custom tasks run their own callback
+            if task.task_type is TaskType.CUSTOM:
+                if task.callback:
+                    await task.callback(task.data)
+                return
+                
             # Execute based on task type
-            if task.task_type == TaskType.REMINDER:
-                await self._handle_reminder(task)
-            elif task.task_type == TaskType.MESSAGE:
-                await self._handle_message(task)
-            elif task.task_type == TaskType.CLEANUP:
-                await self._handle_cleanup(task)
-            elif task.task_type == TaskType.BACKUP:
-                await self._handle_backup(task)
-            elif task.task_type == TaskType.REPORT:
-                await self._handle_report(task)
-            elif task.task_type == TaskType.CUSTOM and task.callback:
-                await task.callback(task.data)
+            handler = self._type_handlers.get(task.task_type)
+            if handler:
+                await handler(task)
                 
         except Exception as e:
             self.logger.error(f"❌ Task execution error: {e}")
             
     async def _handle_reminder(self, task: ScheduledTask):
         """Handle reminder task"""
-        from core.engines.auto_reply_engine import AutoReplyEngine
         # This would send reminder to user/group
         pass
         
@@ -196,7 +273,8 @@ class Scheduler:
             Task ID
         """
         if not task_id:
-            task_id = f"{task_type.value}_{int(time.time())}_{hash(str(data)) % 10000}"
+            # Counter keeps ids unique within a run, the timestamp across restarts
+            task_id = f"{task_type.value}_{int(time.time())}_{next(self._task_counter)}"
             
         execute_at = time.time() + execute_in
         
@@ -213,10 +291,11 @@ class Scheduler:
         )
         
         self.tasks[task_id] = task
+        self._push(task)
         self.logger.info(f"📅 Scheduled task: {task_id} in {execute_in}s")
         
-        # Save tasks
-        await self._save_tasks()
+        # Save tasks (debounced)
+        self._mark_dirty()
         
         return task_id
         
@@ -233,7 +312,7 @@ class Scheduler:
         if task_id in self.tasks:
             del self.tasks[task_id]
             self.logger.info(f"❌ Cancelled task: {task_id}")
-            await self._save_tasks()
+            self._mark_dirty()
             return True
         return False
         
@@ -251,30 +330,63 @@ class Scheduler:
         return [task for task in self.tasks.values() 
                 if task.group_id == group_id]
                 
+    def _live_task(self, entry: tuple) -> Optional[ScheduledTask]:
+        """Return the task a heap entry points to, None if the entry is stale"""
+        task = entry[2]
+        return task if self.tasks.get(task.task_id) is task else None
+        
     def get_due_tasks(self) -> List[ScheduledTask]:
         """Get tasks due for execution"""
-        current_time = time.time()
-        return [task for task in self.tasks.values() 
-                if task.execute_at <= current_time]
+        current_time = time.monotonic_ns()
+        heap = self._heap
+        due = []
+        
+        # Walk only the heap subtrees whose root is due (O(due), not O(all))
+        stack = [0] if heap else []
+        while stack:
+            i = stack.pop()
+            if heap[i][0] > current_time:
+                continue
+            task = self._live_task(heap[i])
+            if task:
+                due.append(task)
+            stack.extend(j for j in (2 * i + 1, 2 * i + 2) if j < len(heap))
+        return due
+        
+    def _next_execution(self) -> float:
+        """Earliest pending deadline, dropping stale entries from the heap top"""
+        while self._heap and self._live_task(self._heap[0]) is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][2].execute_at if self._heap else 0
                 
     async def _load_tasks(self):
         """Load tasks from storage"""
         try:
             tasks_file = "data/scheduled_tasks.json"
-            with open(tasks_file, 'r', encoding='utf-8') as f:
-                tasks_data = json.load(f)
-                
-            for task_data in tasks_data:
-                # Convert string task type to enum
-                task_data['task_type'] = TaskType(task_data['task_type'])
-                # Remove callback (can't serialize functions)
-                if 'callback' in task_data:
-                    del task_data['callback']
-                    
-                task = ScheduledTask(**task_data)
-                # Only add if not expired
-                if task.execute_at > time.time() or task.repeat_interval:
-                    self.tasks[task.task_id] = task
+            tasks_data = await asyncio.to_thread(read_json, tasks_file)
+            
+            # Build tasks in one pass, only keeping pending or repeating ones
+            # (callbacks can't be serialized, so they are never restored)
+            now = time.time()
+            self.tasks = {
+                d['task_id']: ScheduledTask(
+                    task_id=d['task_id'],
+                    task_type=TaskType(d['task_type']),
+                    execute_at=d['execute_at'],
+                    data=d['data'],
+                    repeat_interval=d.get('repeat_interval'),
+                    created_at=d.get('created_at'),
+                    created_by=d.get('created_by'),
+                    group_id=d.get('group_id')
+                )
+                for d in tasks_data
+                if d['execute_at'] > now or d.get('repeat_interval')
+            }
+            
+            # Rebuild the deadline heap in one pass
+            self._heap = [self._heap_entry(task) for task in self.tasks.values()]
+            heapq.heapify(self._heap)
+            self._wakeup.set()
                     
             self.logger.info(f"📂 Loaded {len(self.tasks)} scheduled tasks")
             
@@ -283,42 +395,54 @@ class Scheduler:
         except Exception as e:
             self.logger.error(f"❌ Error loading tasks: {e}")
             
-    async def _save_tasks(self):
-        """Save tasks to storage"""
-        try:
-            tasks_file = "data/scheduled_tasks.json"
-            tasks_data = []
+    async def _save_tasks(self) -> bool:
+        """
+        Save tasks to storage
+        
+        Returns:
+            True if the file was written
+        """
+        async with self._save_lock:
+            try:
+                tasks_file = "data/scheduled_tasks.json"
+                tasks_data = []
+                self._dirty = False
             
-            for task in self.tasks.values():
-                task_dict = {
-                    'task_id': task.task_id,
-                    'task_type': task.task_type.value,
-                    'execute_at': task.execute_at,
-                    'data': task.data,
-                    'repeat_interval': task.repeat_interval,
-                    'created_at': task.created_at,
-                    'created_by': task.created_by,
-                    'group_id': task.group_id
-                }
-                tasks_data.append(task_dict)
+                for task in self.tasks.values():
+                    task_dict = {
+                        'task_id': task.task_id,
+                        'task_type': task.task_type.value,
+                        'execute_at': task.execute_at,
+                        'data': task.data,
+                        'repeat_interval': task.repeat_interval,
+                        'created_at': task.created_at,
+                        'created_by': task.created_by,
+                        'group_id': task.group_id
+                    }
+                    tasks_data.append(task_dict)
                 
-            with open(tasks_file, 'w', encoding='utf-8') as f:
-                json.dump(tasks_data, f, indent=2, ensure_ascii=False)
+                # Serialize compactly, write off the event loop
+                await asyncio.to_thread(_atomic_write, tasks_file, dumps(tasks_data))
                 
-            self.logger.debug(f"💾 Saved {len(tasks_data)} tasks")
+                self.logger.debug(f"💾 Saved {len(tasks_data)} tasks")
+                return True
             
-        except Exception as e:
-            self.logger.error(f"❌ Error saving tasks: {e}")
+            except Exception as e:
+                self._dirty = True
+                self.logger.error(f"❌ Error saving tasks: {e}")
+                return False
             
     def get_stats(self) -> Dict[str, Any]:
         """Get scheduler statistics"""
-        current_time = time.time()
         due_tasks = self.get_due_tasks()
         
+        # Actual per-type counts (every type listed, zero when unused)
+        type_counts = Counter(task.task_type for task in self.tasks.values())
+        
         return {
             'total_tasks': len(self.tasks),
             'due_tasks': len(due_tasks),
-            'task_types': {ttype.value: 0 for ttype in TaskType},
-            'next_execution': min([t.execute_at for t in self.tasks.values()], default=0),
+            'task_types': {ttype.value: type_counts[ttype] for ttype in TaskType},
+            'next_execution': self._next_execution(),
             'running': self.running
         }
\ No newline at end of file
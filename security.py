@@ -5,11 +5,44 @@ Security System - Handles security and protection
 import re
 import logging
 import asyncio
-from typing import Dict, List, Optional, Set, Tuple
-from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional, Set
+from datetime import datetime
 import hashlib
-import secrets
-from dataclasses import dataclass
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+from json_loader import dumps
+from shutdown import register_flush
+
+# Longest text scanned per message (Telegram's own message limit)
+MAX_SCAN_LEN = 4096
+
+# Threat checks run on every message: (name, pattern, reason, weight)
+THREAT_RULES = (
+    # Repeated characters; the upper bound stops the match early on long
+    # runs (a run of 6+ still matches, so detection is unchanged)
+    ('spam', r'(.)\1{5,50}', "Spam pattern detected", 3),
+    ('caps', r'[A-Z]{10,}', "Excessive capitalization", 2),  # Excessive caps
+    ('links', r'https?://\S+', "Contains links", 1),
+    ('phone', r'\b\d{11,}\b', "Phone number detected", 4),  # Phone numbers
+    ('email', r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "Email address detected", 3),
+)
+
+# Compiled once at import and shared by every SecuritySystem
+_THREAT_PATTERNS: Dict[str, re.Pattern] = {
+    name: re.compile(pattern) for name, pattern, _, _ in THREAT_RULES
+}
+_THREAT_CHECKS = tuple(
+    (_THREAT_PATTERNS[name].search, reason, weight)
+    for name, _, reason, weight in THREAT_RULES
+)
+
+@lru_cache(maxsize=4096)
+def _alert_id(alert_type: str, message: str, user_id: Optional[int]) -> str:
+    """Derive a 16 hex char alert ID (repeated alerts hit the cache)"""
+    return hashlib.blake2b(f"{alert_type}{message}{user_id}".encode(), digest_size=8).hexdigest()
 
 @dataclass
 class SecurityAlert:
@@ -31,27 +64,57 @@ class ThreatDetection:
     reasons: List[str]
     action: str = "monitor"  # monitor, warn, mute, ban
 
+@dataclass(slots=True)
+class SuspiciousUser:
+    """Suspicious user tracking data (slotted, one per flagged user)"""
+    threat_count: int = 0
+    total_threat_level: int = 0
+    first_seen: float = 0.0
+    last_seen: float = 0.0
+    reasons: Set[str] = field(default_factory=set)
+    
+    def record(self, now: float, level: int, reasons: List[str]):
+        """Record one flagged message"""
+        self.threat_count += 1
+        self.total_threat_level += level
+        self.last_seen = now
+        self.reasons.update(reasons)
+        
+    @property
+    def avg_threat(self) -> float:
+        """Average threat level per flagged message"""
+        return self.total_threat_level / self.threat_count if self.threat_count else 0.0
+
 class SecuritySystem:
     """Main security system"""
     
     def __init__(self):
         self.logger = logging.getLogger("nomi_security")
-        self.alerts: List[SecurityAlert] = []
+        # Oldest alerts drop off automatically once 1000 are kept
+        self.alerts: deque = deque(maxlen=1000)
+        # Alerts per severity, kept in step with the deque
+        self._severity_counts: Counter = Counter()
         self.blacklist: Set[int] = set()
-        self.suspicious_users: Dict[int, Dict] = {}
+        self.suspicious_users: Dict[int, SuspiciousUser] = {}
         self.threat_patterns = self._load_threat_patterns()
-        self.rate_limits: Dict[str, Dict] = {}
+        # (bound search, reason, weight) walked in order by analyze_message
+        self._threat_checks = _THREAT_CHECKS
+        # Exact sliding-window rate limits: key -> hit times inside the
+        # window (at most `limit` entries), idle keys dropped by cleanup_old_data
+        self._rl_hits: Dict[Hashable, deque] = {}
+        self.rate_limit_window = 60
+        # Alert log lines are buffered and appended in batches
+        self.log_file = "data/security_logs.json"
+        self.log_batch_size = 64
+        self.log_flush_delay = 1.0
+        self._log_buffer: List[str] = []
+        self._log_flush_task: Optional[asyncio.Task] = None
+        # Buffered alert lines are written out on shutdown
+        register_flush(self.flush_alert_log)
         
     def _load_threat_patterns(self) -> Dict[str, re.Pattern]:
         """Load threat detection patterns"""
-        patterns = {
-            'spam': re.compile(r'(.)\1{5,}'),  # Repeated characters
-            'caps': re.compile(r'[A-Z]{10,}'),  # Excessive caps
-            'links': re.compile(r'https?://\S+'),
-            'phone': re.compile(r'\b\d{11,}\b'),  # Phone numbers
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-        }
-        return patterns
+        return _THREAT_PATTERNS
         
     async def analyze_message(self, user_id: int, message: str, 
                             group_id: Optional[int] = None) -> ThreatDetection:
@@ -78,33 +141,23 @@ class SecuritySystem:
                 action="ban"
             )
             
-        # Check for spam patterns
-        if self.threat_patterns['spam'].search(message):
-            threats.append("Spam pattern detected")
-            threat_level += 3
+        # One clock read shared by rate limiting and user tracking
+        now = asyncio.get_running_loop().time()
             
-        # Check excessive caps
-        if self.threat_patterns['caps'].search(message):
-            threats.append("Excessive capitalization")
-            threat_level += 2
+        # Bound the work per message before running any pattern
+        if len(message) > MAX_SCAN_LEN:
+            message = message[:MAX_SCAN_LEN]
             
-        # Check for links (can be adjusted per group)
-        if self.threat_patterns['links'].search(message):
-            threats.append("Contains links")
-            threat_level += 1
-            
-        # Check for personal info
-        if self.threat_patterns['phone'].search(message):
-            threats.append("Phone number detected")
-            threat_level += 4
-            
-        if self.threat_patterns['email'].search(message):
-            threats.append("Email address detected")
-            threat_level += 3
+        # Check spam, caps, links and personal info from the rule table
+        for search, reason, weight in self._threat_checks:
+            if search(message):
+                threats.append(reason)
+                threat_level += weight
             
         # Check rate limiting
-        rate_key = f"{user_id}:{group_id}" if group_id else str(user_id)
-        if not self._check_rate_limit(rate_key):
+        # Int tuple key, no string formatting per message
+        rate_key = (user_id, group_id or 0)
+        if not self._check_rate_limit(rate_key, now=now):
             threats.append("Rate limit exceeded")
             threat_level += 5
             
@@ -120,7 +173,7 @@ class SecuritySystem:
             
         # Update suspicious users
         if threat_level > 0:
-            await self._update_suspicious_user(user_id, threat_level, threats)
+            await self._update_suspicious_user(user_id, threat_level, threats, now=now)
             
         return ThreatDetection(
             is_threat=threat_level > 0,
@@ -129,7 +182,8 @@ class SecuritySystem:
             action=action
         )
         
-    def _check_rate_limit(self, key: str, limit: int = 10, window: int = 60) -> bool:
+    def _check_rate_limit(self, key: Hashable, limit: int = 10, window: Optional[int] = None,
+                          now: Optional[float] = None) -> bool:
         """
         Check rate limit
         
@@ -137,54 +191,43 @@ class SecuritySystem:
             key: Rate limit key
             limit: Max requests per window
             window: Time window in seconds
+            now: Loop time already read by the caller
             
         Returns:
             True if within limits
         """
-        current_time = asyncio.get_event_loop().time()
+        current_time = now if now is not None else asyncio.get_event_loop().time()
+        window = window or self.rate_limit_window
         
-        if key not in self.rate_limits:
-            self.rate_limits[key] = {
-                'count': 1,
-                'window_start': current_time
-            }
-            return True
+        timestamps = self._rl_hits.get(key)
+        if timestamps is None:
+            timestamps = self._rl_hits[key] = deque()
             
-        rate_data = self.rate_limits[key]
-        
-        # Reset window if expired
-        if current_time - rate_data['window_start'] > window:
-            rate_data['count'] = 1
-            rate_data['window_start'] = current_time
-            return True
+        # Drop hits that have left the window
+        while timestamps and current_time - timestamps[0] > window:
+            timestamps.popleft()
             
         # Check limit
-        if rate_data['count'] >= limit:
+        if len(timestamps) >= limit:
             return False
             
-        rate_data['count'] += 1
+        timestamps.append(current_time)
         return True
         
-    async def _update_suspicious_user(self, user_id: int, threat_level: int, reasons: List[str]):
+    async def _update_suspicious_user(self, user_id: int, threat_level: int, reasons: List[str],
+                                      now: Optional[float] = None):
         """Update suspicious user tracking"""
-        if user_id not in self.suspicious_users:
-            self.suspicious_users[user_id] = {
-                'threat_count': 0,
-                'total_threat_level': 0,
-                'first_seen': asyncio.get_event_loop().time(),
-                'last_seen': asyncio.get_event_loop().time(),
-                'reasons': set()
-            }
+        if now is None:
+            now = asyncio.get_event_loop().time()
+            
+        user_data = self.suspicious_users.get(user_id)
+        if user_data is None:
+            user_data = self.suspicious_users[user_id] = SuspiciousUser(first_seen=now)
             
-        user_data = self.suspicious_users[user_id]
-        user_data['threat_count'] += 1
-        user_data['total_threat_level'] += threat_level
-        user_data['last_seen'] = asyncio.get_event_loop().time()
-        user_data['reasons'].update(reasons)
+        user_data.record(now, threat_level, reasons)
         
         # Auto-ban if too many threats
-        avg_threat = user_data['total_threat_level'] / user_data['threat_count']
-        if user_data['threat_count'] >= 5 and avg_threat >= 3:
+        if user_data.threat_count >= 5 and user_data.avg_threat >= 3:
             await self.ban_user(user_id, "Automatic ban: Repeated threats")
             
     async def create_alert(self, alert_type: str, message: str, 
@@ -201,7 +244,7 @@ class SecuritySystem:
             group_id: Related group ID
             data: Additional data
         """
-        alert_id = hashlib.sha256(f"{alert_type}{message}{user_id}".encode()).hexdigest()[:16]
+        alert_id = _alert_id(alert_type, message, user_id)
         
         alert = SecurityAlert(
             alert_id=alert_id,
@@ -214,11 +257,11 @@ class SecuritySystem:
             data=data or {}
         )
         
+        # Account for the alert the deque is about to evict
+        if len(self.alerts) == self.alerts.maxlen:
+            self._severity_counts[self.alerts[0].severity] -= 1
         self.alerts.append(alert)
-        
-        # Keep only last 1000 alerts
-        if len(self.alerts) > 1000:
-            self.alerts = self.alerts[-1000:]
+        self._severity_counts[severity] += 1
             
         self.logger.warning(f"🚨 Security Alert [{severity}/10]: {message}")
         
@@ -226,9 +269,8 @@ class SecuritySystem:
         await self._log_alert(alert)
         
     async def _log_alert(self, alert: SecurityAlert):
-        """Log alert to file"""
+        """Queue alert for the log file (written in batches)"""
         try:
-            log_file = "data/security_logs.json"
             log_entry = {
                 'timestamp': datetime.now().isoformat(),
                 'alert_id': alert.alert_id,
@@ -239,19 +281,38 @@ class SecuritySystem:
                 'group_id': alert.group_id,
                 'data': alert.data
             }
+            self._log_buffer.append(dumps(log_entry))
             
-            import json
-            from pathlib import Path
-            
-            Path("data").mkdir(exist_ok=True)
-            
-            # Append to log file
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            # Full batch goes out now, otherwise within log_flush_delay
+            if len(self._log_buffer) >= self.log_batch_size:
+                await self.flush_alert_log()
+            elif self._log_flush_task is None or self._log_flush_task.done():
+                self._log_flush_task = asyncio.create_task(self._delayed_log_flush())
                 
         except Exception as e:
             self.logger.error(f"❌ Error logging alert: {e}")
             
+    async def _delayed_log_flush(self):
+        """Flush buffered alert lines after log_flush_delay"""
+        await asyncio.sleep(self.log_flush_delay)
+        await self.flush_alert_log()
+        
+    async def flush_alert_log(self):
+        """Append all buffered alert lines to the log file"""
+        if not self._log_buffer:
+            return
+        lines, self._log_buffer = self._log_buffer, []
+        try:
+            await asyncio.to_thread(self._append_log_lines, lines)
+        except Exception as e:
+            self.logger.error(f"❌ Error logging alert: {e}")
+            
+    def _append_log_lines(self, lines: List[str]):
+        """Write a batch of log lines with a single open (runs in a thread)"""
+        Path(self.log_file).parent.mkdir(exist_ok=True)
+        with open(self.log_file, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+            
     async def ban_user(self, user_id: int, reason: str = ""):
         """
         Ban a user
@@ -282,6 +343,22 @@ class SecuritySystem:
         """Check if user is banned"""
         return user_id in self.blacklist
         
+    def pre_filter(self, user_id: int) -> bool:
+        """
+        Cheap synchronous check to run before analyze_message
+        
+        Message handlers should drop the update when this returns True,
+        so banned users never reach the coroutine, regex scan or
+        rate limit bookkeeping.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            True if the message should be dropped
+        """
+        return user_id in self.blacklist
+        
     async def scan_group(self, group_id: int) -> Dict[str, Any]:
         """
         Scan group for security issues
@@ -321,10 +398,7 @@ class SecuritySystem:
         
     def _get_severity_distribution(self) -> Dict[int, int]:
         """Get alert severity distribution"""
-        distribution = {i: 0 for i in range(1, 11)}
-        for alert in self.alerts:
-            distribution[alert.severity] += 1
-        return distribution
+        return {i: self._severity_counts[i] for i in range(1, 11)}
         
     async def cleanup_old_data(self, max_age_hours: int = 720):
         """Cleanup old security data"""
@@ -332,16 +406,23 @@ class SecuritySystem:
         max_age = max_age_hours * 3600
         
         # Clean old alerts
-        self.alerts = [a for a in self.alerts 
-                      if current_time - a.timestamp < max_age]
+        self.alerts = deque((a for a in self.alerts 
+                            if current_time - a.timestamp < max_age), maxlen=self.alerts.maxlen)
+        self._severity_counts = Counter(a.severity for a in self.alerts)
                       
         # Clean old suspicious users
         old_users = []
         for user_id, data in self.suspicious_users.items():
-            if current_time - data['last_seen'] > max_age:
+            if current_time - data.last_seen > max_age:
                 old_users.append(user_id)
                 
         for user_id in old_users:
             del self.suspicious_users[user_id]
             
+        # Drop keys whose newest hit has left the window
+        expired_keys = [key for key, timestamps in self._rl_hits.items()
+                        if not timestamps or current_time - timestamps[-1] > self.rate_limit_window]
+        for key in expired_keys:
+            del self._rl_hits[key]
+            
         self.logger.info(f"🧹 Cleaned {len(old_users)} old suspicious users")
\ No newline at end of file
@@ -5,7 +5,55 @@ Shutdown Manager - Graceful shutdown handling
 import asyncio
 import signal
 import logging
-from typing import List
+import sys
+import weakref
+from typing import Awaitable, Callable, List
+
+# Flush callbacks of components that buffer writes (debounced saves,
+# batched logs), awaited in the save phase of every shutdown. Held as
+# weak references so registering doesn't keep an engine alive.
+_flush_callbacks: List[weakref.ref] = []
+
+def _callback_ref(callback: Callable[[], Awaitable]) -> weakref.ref:
+    """Weak reference to a callback (bound methods need WeakMethod)"""
+    if hasattr(callback, "__self__"):
+        return weakref.WeakMethod(callback)
+    return weakref.ref(callback)
+
+def register_flush(callback: Callable[[], Awaitable]):
+    """
+    Register a coroutine function that writes out pending data
+    
+    Registering the same callback twice has no effect.
+    
+    Args:
+        callback: Async callable taking no arguments (e.g. engine.flush)
+    """
+    ref = _callback_ref(callback)
+    if ref not in _flush_callbacks:
+        _flush_callbacks.append(ref)
+        
+def unregister_flush(callback: Callable[[], Awaitable]):
+    """
+    Remove a callback added with register_flush
+    
+    Args:
+        callback: Previously registered callback
+    """
+    ref = _callback_ref(callback)
+    if ref in _flush_callbacks:
+        _flush_callbacks.remove(ref)
+        
+def _live_flush_callbacks() -> List[Callable[[], Awaitable]]:
+    """Resolve registered callbacks, dropping those whose owner is gone"""
+    live = []
+    for ref in list(_flush_callbacks):
+        callback = ref()
+        if callback is None:
+            _flush_callbacks.remove(ref)
+        else:
+            live.append(callback)
+    return live
 
 class ShutdownManager:
     """Handles graceful shutdown"""
@@ -14,6 +62,8 @@ class ShutdownManager:
         self.logger = logging.getLogger("nomi_shutdown")
         self.shutdown_tasks = []
         self.is_shutting_down = False
+        self._shutdown_task = None
+        self.phase_timeout = 5.0
         
     async def execute(self):
         """Execute shutdown sequence"""
@@ -23,22 +73,28 @@ class ShutdownManager:
         self.is_shutting_down = True
         self.logger.info("🛑 Starting shutdown sequence...")
         
-        # Define shutdown tasks (in reverse order)
-        tasks = [
-            self._stop_background_tasks,
-            self._save_all_data,
-            self._close_connections,
-            self._cleanup_temp,
-            self._generate_shutdown_report
+        # Shutdown phases: tasks within a phase run concurrently,
+        # phases run in order (background tasks stop before anything else)
+        phases = [
+            [self._stop_background_tasks],
+            [self._save_all_data, self._close_connections],
+            [self._cleanup_temp, self._generate_shutdown_report]
         ]
         
-        # Execute tasks
-        for task in tasks:
+        for phase in phases:
             try:
-                await task()
-                await asyncio.sleep(0.3)
-            except Exception as e:
-                self.logger.error(f"❌ Shutdown task failed: {e}")
+                # A hung task must not block the rest of the shutdown
+                results = await asyncio.wait_for(
+                    asyncio.gather(*(task() for task in phase), return_exceptions=True),
+                    timeout=self.phase_timeout
+                )
+            except asyncio.TimeoutError:
+                self.logger.error(f"❌ Shutdown phase timed out after {self.phase_timeout}s")
+                continue
+                
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error(f"❌ Shutdown task failed: {result}")
                 
         self.logger.info("👋 Shutdown completed")
         
@@ -50,10 +106,24 @@ class ShutdownManager:
         """Save all data to persistent storage"""
         self.logger.info("💾 Saving data...")
         
+        # Drain every registered buffer concurrently, one failure doesn't
+        # stop the others
+        results = await asyncio.gather(*(flush() for flush in _live_flush_callbacks()),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"❌ Flush failed: {result}")
+        
     async def _close_connections(self):
         """Close all network connections"""
         self.logger.info("🔌 Closing connections...")
         
+        # Shared keep-alive HTTP session for image downloads. Only present
+        # if image_utils was imported, don't pull in PIL/aiohttp otherwise
+        image_utils = sys.modules.get("core.utils.image_utils")
+        if image_utils is not None:
+            await image_utils.ImageUtils.close_session()
+        
     async def _cleanup_temp(self):
         """Cleanup temporary files"""
         self.logger.info("🧹 Cleaning temporary files...")
@@ -66,7 +136,36 @@ class ShutdownManager:
         """Register a custom shutdown task"""
         self.shutdown_tasks.append(task)
         
-    def handle_signal(self, sig, frame):
-        """Handle shutdown signals"""
+    def install(self, loop: asyncio.AbstractEventLoop):
+        """
+        Install SIGINT/SIGTERM handlers on the event loop
+        
+        Must be called from inside the running loop, e.g.
+        ``manager.install(asyncio.get_running_loop())``. The loop runs the
+        handlers as ordinary callbacks, so creating the shutdown task is safe.
+        
+        Args:
+            loop: Running event loop
+        """
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._on_signal, sig)
+            except NotImplementedError:
+                # Windows event loops have no add_signal_handler
+                signal.signal(sig, lambda s, f: loop.call_soon_threadsafe(self._on_signal, s))
+                
+    def _on_signal(self, sig):
+        """Start shutdown from a loop callback"""
         self.logger.info(f"📶 Received signal {sig}")
-        asyncio.create_task(self.execute())
\ No newline at end of file
+        # Repeated signals (e.g. double Ctrl+C) reuse the running shutdown
+        if self._shutdown_task is None:
+            self._shutdown_task = asyncio.create_task(self.execute())
+            
+    def handle_signal(self, sig, frame):
+        """
+        Handle shutdown signals (deprecated, use install())
+        
+        Hands the signal over to the loop instead of creating the task
+        directly from the signal handler.
+        """
+        asyncio.get_event_loop().call_soon_threadsafe(self._on_signal, sig)
\ No newline at end of file
@@ -3,11 +3,28 @@ Startup Manager - Handles bot startup sequence
 """
 
 import asyncio
+import os
+import sys
 import time
 import logging
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 import importlib.util
 
+from json_loader import read_json
+
+# Parsed config files by path: (mtime_ns, read-only config)
+_CONFIG_CACHE = {}
+
+# Response templates every install must ship
+REQUIRED_RESPONSE_FILES = frozenset({
+    "welcome.json", "goodbye.json", "auto_reply.json",
+    "voice_reply.json", "rules.json", "help.json",
+    "admin.json", "error.json", "notification.json",
+    "event.json", "reminder.json"
+})
+
 class StartupManager:
     """Manages bot startup sequence"""
 
@@ -15,6 +32,7 @@ class StartupManager:
         self.logger = logging.getLogger("nomi_startup")
         self.start_time = None
         self.config = {}  # <-- Added, to store bot config
+        self.responses = {}
 
     async def execute(self):
         """Execute startup sequence"""
@@ -23,73 +41,103 @@ class StartupManager:
 
         # Load bot config
         config_path = Path("config/bot.json")
-        if config_path.exists():
-            import json
-            with open(config_path, "r", encoding="utf-8") as f:
-                self.config = json.load(f)
-            self.logger.info("✅ Bot Token, Admin IDs, and Owner ID loaded successfully")
-        else:
+        try:
+            mtime = config_path.stat().st_mtime_ns
+        except FileNotFoundError:
             self.logger.warning("⚠️ bot.json not found! Please add it in config folder.")
+        else:
+            # Only re-parse when the file changed since the last execute()
+            cached = _CONFIG_CACHE.get(str(config_path))
+            if cached and cached[0] == mtime:
+                self.config = cached[1]
+            else:
+                # Read-only view, safe to share between coroutines and runs
+                self.config = MappingProxyType(read_json(config_path))
+                _CONFIG_CACHE[str(config_path)] = (mtime, self.config)
+            self.logger.info("✅ Bot Token, Admin IDs, and Owner ID loaded successfully")
+
+        # Fail fast before the startup tasks if there is no token
+        if not (os.environ.get("BOT_TOKEN") or self.config.get("token")):
+            raise RuntimeError("BOT_TOKEN missing (set BOT_TOKEN env or token in config/bot.json)")
 
-        # Define startup tasks
-        tasks = [
-            self._check_requirements,
-            self._load_responses,
-            self._init_telegram,
-            self._warmup_cache,
-            self._start_background_tasks,
-            self._verify_modules
+        # Startup stages: tasks within a stage don't depend on each other
+        # and run concurrently, stages run in order
+        stages = [
+            [self._check_requirements],
+            [self._load_responses, self._init_telegram, self._warmup_cache],
+            [self._start_background_tasks, self._verify_modules]
         ]
 
-        # Execute tasks sequentially
-        for task in tasks:
-            try:
-                await task()
-                await asyncio.sleep(0.2)
-            except Exception as e:
-                self.logger.error(f"❌ Startup task failed: {e}")
-                raise
+        for stage in stages:
+            # Let every task in the stage finish, then fail on the first error
+            results = await asyncio.gather(*(task() for task in stage), return_exceptions=True)
+            errors = []
+            for task, result in zip(stage, results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"❌ Startup task {task.__name__} failed: {result}")
+                    errors.append(result)
+            if errors:
+                raise errors[0]
 
         elapsed = time.time() - self.start_time
         self.logger.info(f"✅ Startup completed in {elapsed:.2f} seconds")
 
     async def _check_requirements(self):
         self.logger.info("🔍 Checking system requirements...")
-        import sys
 
-        if sys.version_info < (3, 8):
-            raise RuntimeError("Python 3.8+ required")
+        if sys.version_info < (3, 10):
+            raise RuntimeError("Python 3.10+ required")
 
+        # Look all packages up at once in worker threads (filesystem stats)
         required_packages = ["telegram", "PIL", "aiofiles", "aiohttp"]
-        for pkg in required_packages:
-            if not self._is_package_installed(pkg):
+        installed = await asyncio.gather(*(
+            asyncio.to_thread(self._is_package_installed, pkg) for pkg in required_packages
+        ))
+        for pkg, found in zip(required_packages, installed):
+            if not found:
                 self.logger.warning(f"⚠️ Package {pkg} not found")
 
-    def _is_package_installed(self, package_name: str) -> bool:
-        import importlib.util
-        spec = importlib.util.find_spec(package_name)
-        return spec is not None
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _is_package_installed(package_name: str) -> bool:
+        # Already imported packages need no finder walk; results are
+        # cached so later startup runs skip both checks
+        return package_name in sys.modules or importlib.util.find_spec(package_name) is not None
 
     async def _load_responses(self):
         self.logger.info("📄 Loading response files...")
         response_dir = Path("responses")
         response_dir.mkdir(exist_ok=True)
-        required_files = [
-            "welcome.json", "goodbye.json", "auto_reply.json",
-            "voice_reply.json", "rules.json", "help.json",
-            "admin.json", "error.json", "notification.json",
-            "event.json", "reminder.json"
-        ]
-        missing = [f for f in required_files if not (response_dir / f).exists()]
+
+        # One directory listing instead of probing each file
+        with os.scandir(response_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+        missing = sorted(REQUIRED_RESPONSE_FILES - present)
+        found = sorted(REQUIRED_RESPONSE_FILES & present)
+
+        # Read and parse the present files concurrently in worker threads
+        results = await asyncio.gather(
+            *(asyncio.to_thread(read_json, response_dir / f) for f in found),
+            return_exceptions=True
+        )
+
+        for filename, result in zip(found, results):
+            if isinstance(result, FileNotFoundError):
+                missing.append(filename)
+            elif isinstance(result, Exception):
+                self.logger.error(f"❌ Invalid response file {filename}: {result}")
+            else:
+                self.responses[filename[:-5]] = result
+
         if missing:
             self.logger.warning(f"⚠️ Missing response files: {missing}")
         else:
-            self.logger.info(f"✅ Response files loaded: {required_files}")
+            self.logger.info(f"✅ Response files loaded: {found}")
 
     async def _init_telegram(self):
         self.logger.info("🤖 Initializing Telegram bot...")
-        # Telegram initialization logic goes here
-        await asyncio.sleep(0.1)  # dummy delay for init
+        # Telegram initialization logic goes here; await the client's
+        # readiness once it exists instead of sleeping a fixed delay
         self.logger.info("✅ Telegram bot initialized successfully")
 
     async def _warmup_cache(self):